@@ -0,0 +1,188 @@
+# Importação de Módulos Necessários
+import atexit
+import queue
+import sqlite3
+import threading
+from array import array
+from contextlib import contextmanager
+
+# Esquema: valores em centavos e instantes em nanossegundos desde a época, como no Historico.
+# PRAGMA user_version guarda a versão do esquema (1: instantes em ns; 0: em segundos).
+# O índice (numero, instante, tipo) atende ao extrato por período e à contagem do dia de uma
+# conta (e à leitura dos históricos na inicialização); o índice por instante, às consultas
+# de todas as contas em um intervalo.
+VERSAO_ESQUEMA = 1
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS clientes (
+    cpf TEXT PRIMARY KEY,
+    nome TEXT NOT NULL,
+    data_nascimento TEXT NOT NULL,
+    endereco TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contas (
+    numero INTEGER PRIMARY KEY,
+    agencia TEXT NOT NULL,
+    cpf TEXT NOT NULL REFERENCES clientes (cpf),
+    limite INTEGER,
+    saldo INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS transacoes (
+    id INTEGER PRIMARY KEY,
+    numero INTEGER NOT NULL REFERENCES contas (numero),
+    tipo INTEGER NOT NULL,
+    valor INTEGER NOT NULL,
+    instante INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_contas_cpf ON contas (cpf);
+CREATE INDEX IF NOT EXISTS idx_transacoes_conta_instante ON transacoes (numero, instante, tipo);
+CREATE INDEX IF NOT EXISTS idx_transacoes_instante ON transacoes (instante);
+DROP INDEX IF EXISTS idx_transacoes_conta;
+"""
+
+# Comandos fixos: o sqlite3 mantém cada um preparado no cache de comandos da conexão
+_INSERIR_CLIENTE = "INSERT OR IGNORE INTO clientes (cpf, nome, data_nascimento, endereco) VALUES (?, ?, ?, ?)"
+_INSERIR_CONTA = "INSERT OR IGNORE INTO contas (numero, agencia, cpf, limite) VALUES (?, ?, ?, ?)"
+_ATUALIZAR_SALDO = "UPDATE contas SET saldo = saldo + ? WHERE numero = ?"
+_INSERIR_TRANSACAO = "INSERT INTO transacoes (numero, tipo, valor, instante) VALUES (?, ?, ?, ?)"
+_EXTRATO = (
+    "SELECT instante, tipo, valor FROM transacoes "
+    "WHERE numero = ? AND instante >= ? AND instante < ? ORDER BY instante, id LIMIT ? OFFSET ?"
+)
+_CONTAR = "SELECT COUNT(*) FROM transacoes WHERE numero = ? AND tipo = ? AND instante >= ? AND instante < ?"
+_SEM_FIM = 1 << 62
+
+
+def _conectar(caminho, somente_leitura=False):
+    if somente_leitura:
+        conexao = sqlite3.connect(f"file:{caminho}?mode=ro", uri=True, check_same_thread=False, cached_statements=64)
+    else:
+        conexao = sqlite3.connect(caminho, check_same_thread=False, cached_statements=64)
+    conexao.execute("PRAGMA busy_timeout = 5000")
+    return conexao
+
+
+# Definição da classe ArmazenamentoSQLite
+# Persistência de clientes, contas e histórico em SQLite no modo de journal WAL.
+# As gravações usam uma única conexão protegida por trava; as consultas usam um pequeno
+# grupo de conexões somente leitura, que no modo WAL não bloqueiam nem são bloqueadas
+# pela gravação. As mudanças chegam como os registros do WAL do sistema bancário
+# ({"op": "cliente" | "conta" | "saldo" | "historico", ...}) e cada chamada de `aplicar`
+# é gravada em uma única transação, com o histórico inserido via executemany.
+# Também serve de fonte de consultas do Banco (extrato e contar_transacoes, pelos índices),
+# no lugar dos históricos em memória.
+class ArmazenamentoSQLite:
+    def __init__(self, caminho, leitores=4):
+        self._caminho = str(caminho)
+        self._escrita = _conectar(self._caminho)
+        self._escrita.execute("PRAGMA journal_mode = WAL")
+        self._escrita.execute("PRAGMA synchronous = NORMAL")
+        self._escrita.executescript(ESQUEMA)
+        self._migrar()
+        self._trava_escrita = threading.Lock()
+
+        self._leitores = queue.Queue()
+        for _ in range(leitores):
+            self._leitores.put(_conectar(self._caminho, somente_leitura=True))
+        self._quantidade_leitores = leitores
+        self._fechado = False
+        atexit.register(self.fechar)
+
+    # Converte bancos criados com instantes em segundos para nanossegundos
+    def _migrar(self):
+        versao = self._escrita.execute("PRAGMA user_version").fetchone()[0]
+        if versao >= VERSAO_ESQUEMA:
+            return
+        with self._escrita:
+            self._escrita.execute("UPDATE transacoes SET instante = instante * 1000000000")
+            self._escrita.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+
+    @property
+    def caminho(self):
+        return self._caminho
+
+    # Empresta uma conexão de leitura do grupo (aguarda se todas estiverem em uso)
+    @contextmanager
+    def leitor(self):
+        conexao = self._leitores.get()
+        try:
+            yield conexao
+        finally:
+            self._leitores.put(conexao)
+
+    # Grava uma sequência de registros de mudança em uma única transação. `apos_confirmar`
+    # é chamada com os registros logo depois da confirmação, ainda com a trava de escrita
+    # (na mesma ordem das transações), e o seu resultado é devolvido.
+    def aplicar(self, registros, apos_confirmar=None):
+        clientes = []
+        contas = []
+        saldos = []
+        transacoes = []
+        for registro in registros:
+            operacao = registro["op"]
+            if operacao == "cliente":
+                clientes.append((registro["cpf"], registro["nome"], registro["data_nascimento"], registro["endereco"]))
+            elif operacao == "conta":
+                contas.append((registro["numero"], registro["agencia"], registro["cpf"], registro["limite"]))
+            elif operacao == "saldo":
+                saldos.append((registro["delta"], registro["numero"]))
+            elif operacao == "historico":
+                transacoes.append((registro["numero"], registro["tipo"], registro["valor"], registro["instante_ns"]))
+
+        with self._trava_escrita:
+            with self._escrita:
+                if clientes:
+                    self._escrita.executemany(_INSERIR_CLIENTE, clientes)
+                if contas:
+                    self._escrita.executemany(_INSERIR_CONTA, contas)
+                if saldos:
+                    self._escrita.executemany(_ATUALIZAR_SALDO, saldos)
+                if transacoes:
+                    self._escrita.executemany(_INSERIR_TRANSACAO, transacoes)
+            return apos_confirmar(registros) if apos_confirmar is not None else None
+
+    # Tuplas (nome, data_nascimento, cpf, endereco)
+    def ler_clientes(self):
+        with self.leitor() as conexao:
+            return conexao.execute("SELECT nome, data_nascimento, cpf, endereco FROM clientes ORDER BY rowid").fetchall()
+
+    # Tuplas (numero, agencia, cpf, limite, saldo), em ordem de número
+    def ler_contas(self):
+        with self.leitor() as conexao:
+            return conexao.execute("SELECT numero, agencia, cpf, limite, saldo FROM contas ORDER BY numero").fetchall()
+
+    # Colunas do histórico de cada conta, como arrays tipados: {numero: (instantes, valores, tipos)}
+    def ler_historicos(self):
+        historicos = {}
+        with self.leitor() as conexao:
+            cursor = conexao.execute("SELECT numero, instante, valor, tipo FROM transacoes ORDER BY numero, id")
+            for numero, instante, valor, tipo in cursor:
+                colunas = historicos.get(numero)
+                if colunas is None:
+                    colunas = historicos[numero] = (array("q"), array("q"), array("b"))
+                colunas[0].append(instante)
+                colunas[1].append(valor)
+                colunas[2].append(tipo)
+        return historicos
+
+    # Transações (instante, código do tipo, valor) da conta com instante em [inicio, fim), em
+    # ordem, pelo índice (numero, instante): pula as `deslocamento` primeiras e devolve até `limite`
+    def extrato(self, numero, inicio=None, fim=None, deslocamento=0, limite=None):
+        inicio = -_SEM_FIM if inicio is None else inicio
+        fim = _SEM_FIM if fim is None else fim
+        limite = -1 if limite is None else limite
+        with self.leitor() as conexao:
+            return conexao.execute(_EXTRATO, (numero, inicio, fim, limite, deslocamento)).fetchall()
+
+    # Quantidade de transações de um tipo no intervalo [inicio, fim), só pelo índice, sem ler a tabela
+    def contar_transacoes(self, numero, tipo, inicio, fim):
+        with self.leitor() as conexao:
+            return conexao.execute(_CONTAR, (numero, tipo, inicio, fim)).fetchone()[0]
+
+    def fechar(self):
+        if self._fechado:
+            return
+        self._fechado = True
+        for _ in range(self._quantidade_leitores):
+            self._leitores.get().close()
+        with self._trava_escrita:
+            self._escrita.close()
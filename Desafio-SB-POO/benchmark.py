@@ -0,0 +1,437 @@
+# Importação de Módulos Necessários
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from array import array
+from decimal import Decimal
+from pathlib import Path
+
+from cpf import completar_cpf, validar_cpf, validar_cpfs
+from dinheiro import Dinheiro, para_centavos
+from limites import LIMITE_TRANSACOES_DIARIAS
+from motor_fragmentado import MotorFragmentado
+from registro_log import EscritorLogEmLote
+
+ROOT_PATH = Path(__file__).parent
+
+
+# Carrega o sistema bancário como módulo (o nome do arquivo não é um identificador válido)
+# e redireciona o log para /dev/null, para não poluir o log.txt com as operações medidas
+def carregar_sistema():
+    spec = importlib.util.spec_from_file_location("sistema_bancario", ROOT_PATH / "01-Sistema_Bancario_POO.py")
+    sistema = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(sistema)
+
+    sistema.escritor_log.encerrar()
+    sistema.escritor_log = EscritorLogEmLote(os.devnull)
+    return sistema
+
+
+# Mede o tempo de execução de uma função e devolve as operações por segundo.
+# Com `repeticoes` > 1 vale a execução mais rápida, como no timeit, para reduzir o ruído.
+def medir(funcao, operacoes, repeticoes=1):
+    duracao = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        duracao = min(duracao, time.perf_counter() - inicio)
+    return {"segundos": duracao, "ops_por_segundo": operacoes / duracao if duracao else float("inf")}
+
+
+# Aritmética de saldo com float, Decimal e centavos inteiros (Dinheiro)
+def benchmark_dinheiro(n=1_000_000):
+    resultados = {}
+
+    def com_float():
+        saldo = 0.0
+        for _ in range(n):
+            saldo += 0.1
+        resultados["float_exato"] = saldo == n / 10
+
+    def com_decimal():
+        saldo = Decimal(0)
+        valor = Decimal("0.10")
+        for _ in range(n):
+            saldo += valor
+        resultados["decimal_exato"] = saldo == Decimal(n) / 10
+
+    def com_centavos():
+        saldo = 0
+        valor = para_centavos(Dinheiro.de_reais("0.10"))
+        for _ in range(n):
+            saldo += valor
+        resultados["centavos_exato"] = Dinheiro(saldo) == Dinheiro.de_reais(Decimal(n) / 10)
+
+    def conversao_de_texto():
+        for _ in range(n // 10):
+            Dinheiro.de_reais("1234.56")
+
+    resultados["float"] = medir(com_float, n)
+    resultados["decimal"] = medir(com_decimal, n)
+    resultados["centavos"] = medir(com_centavos, n)
+    resultados["conversao_de_texto"] = medir(conversao_de_texto, n // 10)
+
+    sistema = carregar_sistema()
+    cliente = sistema.PessoaFisica("Benchmark", "01/01/2000", "00000000000", "Rua A")
+    conta = sistema.ContaCorrente(cliente)
+    valor = Dinheiro.de_reais("0.10")
+    resultados["conta_depositar"] = medir(lambda: [conta.depositar(valor) for _ in range(n // 10)], n // 10)
+    sistema.escritor_log.encerrar()
+    return resultados
+
+
+# Busca de cliente por CPF: varredura da lista (filtrar_cliente) contra o índice (RegistroClientes)
+def benchmark_busca_cliente(tamanhos=(1_000, 10_000, 100_000), buscas=200):
+    sistema = carregar_sistema()
+    resultados = {}
+
+    for tamanho in tamanhos:
+        lista = [sistema.PessoaFisica(f"Cliente {i}", "01/01/2000", f"{i:011d}", "Rua A") for i in range(tamanho)]
+        registro = sistema.RegistroClientes(lista)
+        cpfs = [f"{(i * 7919) % tamanho:011d}" for i in range(buscas)]
+
+        resultados[f"lista_{tamanho}"] = medir(lambda: [sistema.filtrar_cliente(cpf, lista) for cpf in cpfs], buscas)
+        resultados[f"indice_{tamanho}"] = medir(lambda: [sistema.filtrar_cliente(cpf, registro) for cpf in cpfs], buscas)
+
+    sistema.escritor_log.encerrar()
+    return resultados
+
+
+# Saques e depósitos concorrentes em poucas contas: confere que o saldo final é exatamente
+# o esperado pelas operações aceitas (e nunca negativo) e mede a vazão por número de threads
+def benchmark_concorrencia(threads=(1, 2, 4, 8), operacoes_por_thread=20_000, numero_contas=4):
+    sistema = carregar_sistema()
+    resultados = {}
+
+    for quantidade in threads:
+        cliente = sistema.PessoaFisica("Benchmark", "01/01/2000", "00000000000", "Rua A")
+        contas = [sistema.Conta(cliente) for _ in range(numero_contas)]
+        movimentos = [[0] * numero_contas for _ in range(quantidade)]
+        saldo_negativo = []
+
+        def trabalhar(indice):
+            gerador = random.Random(indice)
+            for _ in range(operacoes_por_thread):
+                posicao = gerador.randrange(numero_contas)
+                conta = contas[posicao]
+                valor = gerador.randint(1, 100)
+                if gerador.random() < 0.5:
+                    if sistema.CODIGOS_RESULTADO.get(conta.depositar(valor)) == "ok":
+                        movimentos[indice][posicao] += valor * 100
+                elif sistema.CODIGOS_RESULTADO.get(conta.sacar(valor)) == "ok":
+                    movimentos[indice][posicao] -= valor * 100
+                if conta.saldo < 0:
+                    saldo_negativo.append(conta.numero)
+
+        def executar():
+            trabalhadores = [threading.Thread(target=trabalhar, args=(indice,)) for indice in range(quantidade)]
+            for trabalhador in trabalhadores:
+                trabalhador.start()
+            for trabalhador in trabalhadores:
+                trabalhador.join()
+
+        resultados[f"threads_{quantidade}"] = medir(executar, quantidade * operacoes_por_thread)
+        esperado = [sum(movimento[posicao] for movimento in movimentos) for posicao in range(numero_contas)]
+        resultados[f"threads_{quantidade}_saldos_corretos"] = [int(conta.saldo) for conta in contas] == esperado
+        resultados[f"threads_{quantidade}_sem_saldo_negativo"] = not saldo_negativo
+
+    # Criação concorrente de contas: nenhum número pode se repetir
+    numeros = []
+
+    def criar_contas():
+        cliente = sistema.PessoaFisica("Benchmark", "01/01/2000", "00000000000", "Rua A")
+        numeros.extend(sistema.Conta(cliente).numero for _ in range(10_000))
+
+    trabalhadores = [threading.Thread(target=criar_contas) for _ in range(8)]
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+    resultados["numeros_de_conta_unicos"] = len(numeros) == len(set(numeros))
+
+    sistema.escritor_log.encerrar()
+    return resultados
+
+
+# Vazão do motor fragmentado em processos, aplicando lotes de depósitos e saques
+def benchmark_fragmentos(fragmentos=(1, 2, 4), numero_contas=20_000, operacoes=200_000, tamanho_lote=20_000):
+    sistema = carregar_sistema()
+    resultados = {}
+    gerador = random.Random(0)
+
+    for quantidade in fragmentos:
+        with MotorFragmentado(sistema.Banco, quantidade) as motor:
+            for indice in range(numero_contas):
+                cpf = completar_cpf(f"{indice + 1:09d}")
+                motor.criar_cliente(f"Cliente {indice}", "01/01/2000", cpf, "Rua A")
+                motor.criar_conta(cpf)
+
+            lotes = [
+                [
+                    (gerador.choice(("Deposito", "Saque")), gerador.randint(1, numero_contas), gerador.randint(1, 400))
+                    for _ in range(tamanho_lote)
+                ]
+                for _ in range(operacoes // tamanho_lote)
+            ]
+            resultados[f"fragmentos_{quantidade}"] = medir(lambda: [motor.aplicar_lote(lote) for lote in lotes], operacoes)
+
+    sistema.escritor_log.encerrar()
+    return resultados
+
+
+# Caminhos quentes do sistema: depósito e saque, transação com verificação do limite diário,
+# geração do extrato (sem e com cache) e busca de cliente, em vários tamanhos
+def benchmark_nucleo(tamanhos=(1_000, 10_000, 100_000), operacoes=100_000, repeticoes=3):
+    sistema = carregar_sistema()
+    resultados = {}
+    gerador = random.Random(0)
+
+    cliente = sistema.PessoaFisica("Benchmark", "01/01/2000", "00000000000", "Rua A")
+    conta = sistema.ContaCorrente(cliente)
+    resultados["conta_depositar"] = medir(lambda: [conta.depositar(1) for _ in range(operacoes)], operacoes, repeticoes)
+    resultados["conta_sacar"] = medir(lambda: [conta.sacar(1) for _ in range(operacoes)], operacoes, repeticoes)
+
+    # Caminho aceito: cada conta recebe os depósitos e depois os saques permitidos no dia
+    # (limites.LIMITE_TRANSACOES_DIARIAS de cada tipo), todos dentro do saldo e do limite por
+    # saque; a verificação do limite diário é feita em todas as transações
+    limite = LIMITE_TRANSACOES_DIARIAS
+    contas = [sistema.ContaCorrente(cliente) for _ in range(-(-operacoes // (2 * limite)))]
+    for conta_cliente in contas:
+        cliente.adicionar_conta(conta_cliente)
+    transacoes = [
+        (conta_cliente, tipo(valor))
+        for conta_cliente in contas
+        for tipo, valor in [(sistema.Deposito, 300)] * limite + [(sistema.Saque, 100)] * limite
+    ][:operacoes]
+    aceitas = []
+    resultados["cliente_realizar_transacao"] = medir(
+        lambda: aceitas.extend(cliente.realizar_transacao(conta, transacao) for conta, transacao in transacoes),
+        len(transacoes),
+    )
+    resultados["cliente_realizar_transacao_todas_aceitas"] = all(
+        sistema.CODIGOS_RESULTADO.get(resultado) == "ok" for resultado in aceitas
+    )
+
+    # Limite esgotado: as mesmas contas, que já usaram todas as transações do dia, recusam
+    # cada nova transação na verificação do limite diário
+    resultados["cliente_realizar_transacao_limite_esgotado"] = medir(
+        lambda: [cliente.realizar_transacao(conta, transacao) for conta, transacao in transacoes], len(transacoes)
+    )
+
+    for tamanho in tamanhos:
+        historico = sistema.Historico()
+        inicio = time.time_ns() - tamanho * 1_000_000_000
+        historico.restaurar_colunas(
+            array("q", range(inicio, inicio + tamanho * 1_000_000_000, 1_000_000_000)),
+            array("q", (gerador.randint(1, 100_000) for _ in range(tamanho))),
+            array("b", (gerador.randint(0, 1) for _ in range(tamanho))),
+            0,
+        )
+
+        def relatorio_sem_cache():
+            sistema.cache_extratos.limpar()
+            historico.gerar_relatorio()
+
+        resultados[f"gerar_relatorio_{tamanho}"] = medir(relatorio_sem_cache, tamanho, repeticoes)
+        historico.gerar_relatorio()
+        resultados[f"gerar_relatorio_cache_{tamanho}"] = medir(historico.gerar_relatorio, tamanho, repeticoes)
+        sistema.cache_extratos.limpar()
+
+    for tamanho in tamanhos:
+        lista = [sistema.PessoaFisica(f"Cliente {i}", "01/01/2000", f"{i:011d}", "Rua A") for i in range(tamanho)]
+        registro = sistema.RegistroClientes(lista)
+        # A varredura da lista é linear: menos buscas nos tamanhos maiores
+        buscas = max(10, 200_000 // tamanho)
+        cpfs = [f"{gerador.randrange(tamanho):011d}" for _ in range(buscas)]
+
+        resultados[f"filtrar_cliente_lista_{tamanho}"] = medir(
+            lambda: [sistema.filtrar_cliente(cpf, lista) for cpf in cpfs], buscas, repeticoes
+        )
+        resultados[f"filtrar_cliente_indice_{tamanho}"] = medir(
+            lambda: [sistema.filtrar_cliente(cpf, registro) for cpf in cpfs], buscas, repeticoes
+        )
+        del lista, registro
+
+    sistema.escritor_log.encerrar()
+    return resultados
+
+
+# Memória ocupada por cliente, por conta e por transação (tracemalloc), incluindo os índices
+# do Banco; os resultados são bytes por objeto
+def benchmark_memoria(quantidade=100_000, transacoes_por_conta=10):
+    sistema = carregar_sistema()
+    resultados = {}
+    banco = sistema.Banco()
+    cpfs = [f"{indice:011d}" for indice in range(quantidade)]
+
+    def alocado(funcao):
+        tracemalloc.start()
+        antes = tracemalloc.get_traced_memory()[0]
+        funcao()
+        sistema.escritor_log.descarregar()
+        depois = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return depois - antes
+
+    def criar_clientes():
+        for cpf in cpfs:
+            banco.clientes.adicionar(sistema.PessoaFisica(f"Cliente {cpf}", "01/01/2000", cpf, "Rua A"))
+
+    resultados["bytes_por_cliente"] = alocado(criar_clientes) / quantidade
+    resultados["bytes_por_conta"] = alocado(lambda: [banco.criar_conta(cpf) for cpf in cpfs]) / quantidade
+
+    contas = list(banco.contas)
+    instante = time.time_ns()
+
+    def registrar_transacoes():
+        for conta in contas:
+            for _ in range(transacoes_por_conta):
+                conta.historico.restaurar_transacao(1, 100, instante)
+
+    resultados["bytes_por_transacao"] = alocado(registrar_transacoes) / (quantidade * transacoes_por_conta)
+    sistema.escritor_log.encerrar()
+    return resultados
+
+
+# Validação de CPF: validador escalar contra o validador em lote, sobre códigos inteiros e
+# sobre textos de 11 bytes (metade dos CPFs gerados é válida)
+def benchmark_cpf(quantidade=10_000_000, escalares=200_000):
+    resultados = {}
+    gerador = random.Random(0)
+    textos = [
+        completar_cpf(f"{gerador.randrange(1, 10**9):09d}") if indice % 2 else f"{gerador.randrange(10**11):011d}"
+        for indice in range(escalares)
+    ]
+    resultados["escalar"] = medir(lambda: [validar_cpf(texto) for texto in textos], escalares)
+    resultados["lote_textos"] = medir(lambda: validar_cpfs(textos), escalares)
+
+    try:
+        import numpy as np
+    except ImportError:
+        return resultados
+
+    repeticoes = -(-quantidade // escalares)
+    codigos = np.tile(np.array([int(texto) for texto in textos], dtype=np.int64), repeticoes)[:quantidade]
+    bytes_cpfs = np.tile(np.array(textos, dtype="S11"), repeticoes)[:quantidade]
+    resultados["lote_codigos"] = medir(lambda: validar_cpfs(codigos), quantidade)
+    resultados["lote_bytes"] = medir(lambda: validar_cpfs(bytes_cpfs), quantidade)
+    return resultados
+
+
+# Exportação dos históricos em CSV e em colunas .npy, com um e com vários processos
+def benchmark_exportacao(numero_contas=200, transacoes_por_conta=20_000, processos=(1, 4)):
+    sistema = carregar_sistema()
+    banco = sistema.Banco()
+    inicio = time.time_ns()
+    for indice in range(numero_contas):
+        cpf = completar_cpf(f"{indice + 1:09d}")
+        banco.criar_cliente(f"Cliente {indice}", "01/01/2000", cpf, "Rua A")
+        conta = banco.contas.buscar("0001", banco.criar_conta(cpf))
+        conta.historico.restaurar_colunas(
+            array("q", range(inicio, inicio + transacoes_por_conta)),
+            array("q", range(transacoes_por_conta)),
+            array("b", [1]) * transacoes_por_conta,
+            0,
+        )
+
+    total = numero_contas * transacoes_por_conta
+    resultados = {}
+    for formato in ("csv", "colunas"):
+        for quantidade in processos:
+            with tempfile.TemporaryDirectory() as destino:
+                resultados[f"{formato}_{quantidade}"] = medir(
+                    lambda: sistema.exportar_historicos(banco, destino, formato, quantidade), total
+                )
+    sistema.escritor_log.encerrar()
+    return resultados
+
+
+BENCHMARKS = {
+    "nucleo": benchmark_nucleo,
+    "memoria": benchmark_memoria,
+    "dinheiro": benchmark_dinheiro,
+    "busca_cliente": benchmark_busca_cliente,
+    "concorrencia": benchmark_concorrencia,
+    "fragmentos": benchmark_fragmentos,
+    "cpf": benchmark_cpf,
+    "exportacao": benchmark_exportacao,
+}
+
+
+def exibir(nome, resultados):
+    print(f"\n=== {nome} ===")
+    for chave, valor in resultados.items():
+        if isinstance(valor, dict):
+            print(f"{chave:<40}{valor['ops_por_segundo']:>16,.0f} ops/s")
+        else:
+            print(f"{chave:<40}{valor!s:>16}")
+
+
+# Compara os resultados com uma linha de base gravada anteriormente (mesmo formato JSON).
+# Devolve as medições cuja vazão caiu mais que `tolerancia` (fração) e as verificações
+# (valores True/False) que deixaram de passar: [(benchmark, medição, atual, base), ...]
+def comparar(resultados, base, tolerancia=0.2):
+    regressoes = []
+    for nome, medicoes in resultados.items():
+        for chave, valor in medicoes.items():
+            anterior = base.get(nome, {}).get(chave)
+            if anterior is None:
+                continue
+            if isinstance(valor, dict):
+                if valor["ops_por_segundo"] < anterior["ops_por_segundo"] * (1 - tolerancia):
+                    regressoes.append((nome, chave, valor["ops_por_segundo"], anterior["ops_por_segundo"]))
+            elif anterior is True and valor is not True:
+                regressoes.append((nome, chave, valor, anterior))
+    return regressoes
+
+
+# Execução dos benchmarks:
+#   python benchmark.py [nome ...] [--tamanhos 1000 ... 10000000] [--saida resultados.json]
+#                       [--base base.json [--tolerancia 0.2]]
+# Com --base, termina com código 1 se alguma medição regrediu em relação à linha de base.
+# benchmark_base.json é a linha de base do repositório, gerada com `--saida benchmark_base.json`
+# e os parâmetros padrão; em outra máquina, gere a própria linha de base antes de comparar.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks do sistema bancário")
+    parser.add_argument("nomes", nargs="*", metavar="nome", help=f"benchmarks a executar: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--tamanhos", type=int, nargs="+", help="quantidades de clientes e transações (nucleo)")
+    parser.add_argument("--saida", help="arquivo JSON onde gravar os resultados")
+    parser.add_argument("--base", help="arquivo JSON de linha de base para comparação")
+    parser.add_argument("--tolerancia", type=float, default=0.2)
+    argumentos = parser.parse_args()
+    for nome in argumentos.nomes:
+        if nome not in BENCHMARKS:
+            parser.error(f"benchmark desconhecido: {nome}")
+
+    resultados = {}
+    for nome in argumentos.nomes or list(BENCHMARKS):
+        if nome == "nucleo" and argumentos.tamanhos:
+            resultados[nome] = benchmark_nucleo(tuple(argumentos.tamanhos))
+        else:
+            resultados[nome] = BENCHMARKS[nome]()
+        exibir(nome, resultados[nome])
+
+    # O arquivo leva também o ambiente da medição: uma linha de base só é comparável com
+    # execuções na mesma máquina e versão do Python
+    if argumentos.saida:
+        ambiente = {"python": platform.python_version(), "plataforma": platform.platform(), "cpus": os.cpu_count()}
+        with open(argumentos.saida, "w", encoding="utf-8") as arquivo:
+            json.dump({**resultados, "_ambiente": ambiente}, arquivo, indent=2)
+
+    if argumentos.base:
+        with open(argumentos.base, encoding="utf-8") as arquivo:
+            regressoes = comparar(resultados, json.load(arquivo), argumentos.tolerancia)
+        print("\n=== comparação com a linha de base ===")
+        for nome, chave, atual, anterior in regressoes:
+            print(f"REGRESSÃO {nome}.{chave}: {atual} (base: {anterior})")
+        if not regressoes:
+            print("Nenhuma regressão.")
+        sys.exit(1 if regressoes else 0)
@@ -0,0 +1,60 @@
+# Importação de Módulos Necessários
+import threading
+from collections import OrderedDict
+
+
+# Definição da classe CacheLRU
+# Cache com capacidade total limitada (soma dos tamanhos informados em `guardar`), que
+# descarta as entradas usadas há mais tempo quando a capacidade é excedida. Seguro entre threads.
+class CacheLRU:
+    def __init__(self, capacidade):
+        self._capacidade = capacidade
+        self._entradas = OrderedDict()  # chave -> (valor, tamanho)
+        self._tamanho = 0
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    @property
+    def capacidade(self):
+        return self._capacidade
+
+    @property
+    def tamanho(self):
+        return self._tamanho
+
+    def obter(self, chave):
+        with self._trava:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                return None
+            self._entradas.move_to_end(chave)
+            return entrada[0]
+
+    # Guarda o valor; devolve False (e descarta a entrada anterior) se ele sozinho excede a capacidade
+    def guardar(self, chave, valor, tamanho):
+        with self._trava:
+            anterior = self._entradas.pop(chave, None)
+            if anterior is not None:
+                self._tamanho -= anterior[1]
+            if tamanho > self._capacidade:
+                return False
+
+            self._entradas[chave] = (valor, tamanho)
+            self._tamanho += tamanho
+            while self._tamanho > self._capacidade:
+                _, (_, tamanho_removido) = self._entradas.popitem(last=False)
+                self._tamanho -= tamanho_removido
+            return True
+
+    def remover(self, chave):
+        with self._trava:
+            entrada = self._entradas.pop(chave, None)
+            if entrada is not None:
+                self._tamanho -= entrada[1]
+
+    def limpar(self):
+        with self._trava:
+            self._entradas.clear()
+            self._tamanho = 0
@@ -0,0 +1,107 @@
+# Importação de Módulos Necessários
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele a validação em lote usa o validador escalar
+    np = None
+
+# Pesos do primeiro e do segundo dígito verificador
+_PESOS_PRIMEIRO = tuple(range(10, 1, -1))
+_PESOS_SEGUNDO = tuple(range(11, 1, -1))
+
+
+# Normaliza o CPF mantendo apenas os dígitos ("123.456.789-09" -> "12345678909")
+def normalizar_cpf(cpf):
+    cpf = str(cpf).strip()
+    if cpf.isdigit():
+        return cpf
+    return "".join(caractere for caractere in cpf if caractere.isdigit())
+
+
+def _digito_verificador(numeros, pesos):
+    return sum(numero * peso for numero, peso in zip(numeros, pesos)) * 10 % 11 % 10
+
+
+# Verifica formato (11 dígitos, com ou sem pontuação) e dígitos verificadores.
+# CPFs com todos os dígitos iguais ("111.111.111-11") passam no cálculo, mas são inválidos.
+def validar_cpf(cpf):
+    digitos = normalizar_cpf(cpf)
+    if len(digitos) != 11 or not digitos.isascii() or digitos == digitos[0] * 11:
+        return False
+
+    numeros = [ord(caractere) - 48 for caractere in digitos]
+    return (
+        _digito_verificador(numeros, _PESOS_PRIMEIRO) == numeros[9]
+        and _digito_verificador(numeros, _PESOS_SEGUNDO) == numeros[10]
+    )
+
+
+# Completa 9 dígitos com os dois dígitos verificadores ("529982247" -> "52998224725")
+def completar_cpf(base):
+    numeros = [ord(caractere) - 48 for caractere in base]
+    numeros.append(_digito_verificador(numeros, _PESOS_PRIMEIRO))
+    numeros.append(_digito_verificador(numeros, _PESOS_SEGUNDO))
+    return "".join(chr(numero + 48) for numero in numeros)
+
+
+# Quantidade de CPFs validados por vez no NumPy: as matrizes intermediárias de um bloco
+# cabem no cache do processador, em vez de percorrer a memória várias vezes
+TAMANHO_BLOCO_VALIDACAO = 1 << 15
+
+
+# Valida muitos CPFs de uma vez e devolve um array booleano (uma lista sem NumPy).
+# Aceita arrays NumPy de inteiros (códigos de 11 dígitos, sem os zeros à esquerda), arrays
+# de bytes com 11 caracteres ("S11", lidos direto da memória) ou qualquer sequência de
+# textos e inteiros, que são normalizados antes.
+def validar_cpfs(cpfs):
+    if np is None:
+        return [validar_cpf(f"{cpf:011d}" if isinstance(cpf, int) else cpf) for cpf in cpfs]
+
+    if isinstance(cpfs, np.ndarray) and cpfs.dtype.kind in "iu":
+        return _validar_blocos(cpfs.astype(np.int64, copy=False), _digitos_de_codigos)
+    if isinstance(cpfs, np.ndarray) and cpfs.dtype == np.dtype("S11"):
+        return _validar_blocos(cpfs, _digitos_de_bytes)
+
+    textos = [f"{cpf:011d}" if isinstance(cpf, int) else normalizar_cpf(cpf) for cpf in cpfs]
+    formato_valido = np.fromiter((len(texto) == 11 and texto.isascii() for texto in textos), bool, len(textos))
+    # Textos fora do formato viram zeros (CPF inválido) para caber no array de 11 bytes
+    bytes_cpfs = np.array([texto.encode() if valido else b"0" * 11 for texto, valido in zip(textos, formato_valido)], "S11")
+    return _validar_blocos(bytes_cpfs, _digitos_de_bytes) & formato_valido
+
+
+def _validar_blocos(cpfs, digitos_de):
+    resultado = np.empty(len(cpfs), dtype=bool)
+    for inicio in range(0, len(cpfs), TAMANHO_BLOCO_VALIDACAO):
+        bloco = cpfs[inicio : inicio + TAMANHO_BLOCO_VALIDACAO]
+        resultado[inicio : inicio + len(bloco)] = _validar_digitos(*digitos_de(bloco))
+    return resultado
+
+
+# Os dígitos de um bloco ficam em uma matriz (11, n), um dígito por linha: cada passo do
+# cálculo é uma operação sobre um vetor contíguo
+
+# Dígitos de códigos inteiros, e quais códigos estão no intervalo válido
+def _digitos_de_codigos(codigos):
+    no_intervalo = (codigos >= 0) & (codigos < 10**11)
+    # Uma única divisão em 64 bits separa 5 + 6 dígitos; o restante é feito em 32 bits
+    altos, baixos = np.divmod(np.abs(codigos) % 10**11, 10**6)
+    digitos = np.empty((11, len(codigos)), dtype=np.int32)
+    for restante, linhas in ((baixos.astype(np.int32), range(10, 4, -1)), (altos.astype(np.int32), range(4, -1, -1))):
+        for linha in linhas:
+            restante, digitos[linha] = np.divmod(restante, 10)
+    return digitos, no_intervalo
+
+
+# Dígitos lidos diretamente dos bytes ASCII, e quais CPFs só têm dígitos
+def _digitos_de_bytes(textos):
+    digitos = np.ascontiguousarray(textos).view(np.uint8).reshape(-1, 11).T.astype(np.int32) - 48
+    return digitos, ((digitos >= 0) & (digitos <= 9)).all(axis=0)
+
+
+def _validar_digitos(digitos, formato_valido):
+    primeiro = np.array(_PESOS_PRIMEIRO, dtype=np.int32) @ digitos[:9] * 10 % 11 % 10
+    segundo = np.array(_PESOS_SEGUNDO, dtype=np.int32) @ digitos[:10] * 10 % 11 % 10
+    valido = formato_valido & (primeiro == digitos[9]) & (segundo == digitos[10])
+    repetidos = digitos[1] == digitos[0]
+    for linha in digitos[2:]:
+        repetidos &= linha == digitos[0]
+    return valido & ~repetidos
@@ -0,0 +1,175 @@
+# Importação de Módulos Necessários
+import math
+import operator
+from decimal import Decimal, InvalidOperation
+
+_CEM = Decimal(100)
+# Faixa em centavos que cabe em um inteiro de 64 bits (colunas do histórico, SQLite, .npy)
+CENTAVOS_MINIMO = -(1 << 63)
+CENTAVOS_MAXIMO = (1 << 63) - 1
+
+
+# Definição da classe Dinheiro
+# Valor monetário exato em centavos inteiros. Herda de int para que int() e as colunas
+# numpy/SQLite recebam os centavos diretamente, mas a aritmética e as comparações são
+# sobrescritas: o resultado continua sendo Dinheiro e números comuns (int, float,
+# Decimal) são interpretados em reais, nunca em centavos.
+class Dinheiro(int):
+    __slots__ = ()
+
+    # Converte um valor em reais (str, float, int ou Decimal) para centavos exatos
+    @classmethod
+    def de_reais(cls, valor):
+        if isinstance(valor, Dinheiro):
+            return valor
+
+        try:
+            if isinstance(valor, str):
+                valor = valor.strip()
+                if "," in valor and "." not in valor:
+                    valor = valor.replace(",", ".")
+                decimal = Decimal(valor)
+            elif isinstance(valor, float):
+                # repr do float devolve o menor texto que o representa ("0.1", não 0.1000000000000000055...)
+                decimal = Decimal(repr(valor))
+            else:
+                decimal = Decimal(valor)
+        except (InvalidOperation, TypeError):
+            raise ValueError(f"Valor monetário inválido: {valor!r}") from None
+
+        if not decimal.is_finite():
+            raise ValueError(f"Valor monetário inválido: {valor!r}")
+
+        # Expoentes muito grandes ("1e999999") estouram o contexto do Decimal na multiplicação
+        try:
+            centavos = decimal * _CEM
+            inteiro = centavos.to_integral_value()
+        except ArithmeticError:
+            raise ValueError(f"Valor monetário fora da faixa permitida: {valor!r}") from None
+        if centavos != inteiro:
+            raise ValueError(f"O valor deve ter no máximo duas casas decimais: {valor!r}")
+        if not CENTAVOS_MINIMO <= inteiro <= CENTAVOS_MAXIMO:
+            raise ValueError(f"Valor monetário fora da faixa permitida: {valor!r}")
+        return cls(int(inteiro))
+
+    @classmethod
+    def de_centavos(cls, centavos):
+        return cls(centavos)
+
+    @property
+    def centavos(self):
+        return int(self)
+
+    @property
+    def reais(self):
+        return Decimal(int(self)).scaleb(-2)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}('{self.reais}')"
+
+    def __str__(self):
+        return str(self.reais)
+
+    def __format__(self, especificacao):
+        return format(self.reais, especificacao)
+
+    def __float__(self):
+        return float(self.reais)
+
+    # Centavos do outro operando: Dinheiro já está em centavos, números comuns estão em reais
+    @staticmethod
+    def _centavos_do_operando(outro):
+        if isinstance(outro, Dinheiro):
+            return int(outro)
+        if isinstance(outro, bool) or not isinstance(outro, (int, float, Decimal)):
+            return None
+        return int(Dinheiro.de_reais(outro))
+
+    def __add__(self, outro):
+        centavos = self._centavos_do_operando(outro)
+        if centavos is None:
+            return NotImplemented
+        return Dinheiro(int(self) + centavos)
+
+    __radd__ = __add__
+
+    def __sub__(self, outro):
+        centavos = self._centavos_do_operando(outro)
+        if centavos is None:
+            return NotImplemented
+        return Dinheiro(int(self) - centavos)
+
+    def __rsub__(self, outro):
+        centavos = self._centavos_do_operando(outro)
+        if centavos is None:
+            return NotImplemented
+        return Dinheiro(centavos - int(self))
+
+    # Só faz sentido multiplicar dinheiro por uma quantidade inteira
+    def __mul__(self, outro):
+        if isinstance(outro, (bool, Dinheiro)) or not isinstance(outro, int):
+            raise TypeError(f"Dinheiro só pode ser multiplicado por um inteiro, não por {type(outro).__name__}")
+        return Dinheiro(int(self) * outro)
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Dinheiro(-int(self))
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Dinheiro(abs(int(self)))
+
+    # Divisão, resto e potência de int operariam sobre os centavos e devolveriam números
+    # sem unidade; em vez de um resultado silenciosamente errado, a operação é recusada
+    def _operacao_nao_suportada(self, *_):
+        raise TypeError("Operação não suportada para Dinheiro")
+
+    __truediv__ = __rtruediv__ = _operacao_nao_suportada
+    __floordiv__ = __rfloordiv__ = _operacao_nao_suportada
+    __mod__ = __rmod__ = _operacao_nao_suportada
+    __divmod__ = __rdivmod__ = _operacao_nao_suportada
+    __pow__ = __rpow__ = _operacao_nao_suportada
+
+    # Comparações em reais, com a mesma semântica exata de Decimal (Dinheiro('0.10') != 0.1,
+    # assim como Decimal('0.1') != 0.1); o hash acompanha a igualdade
+    def _comparar(self, outro, operacao):
+        if isinstance(outro, Dinheiro):
+            return operacao(int(self), int(outro))
+        if isinstance(outro, bool) or not isinstance(outro, (int, float, Decimal)):
+            return NotImplemented
+        if isinstance(outro, float) and math.isnan(outro):
+            return operacao is operator.ne
+        if isinstance(outro, Decimal) and outro.is_nan():
+            return operacao is operator.ne
+        return operacao(self.reais, outro)
+
+    def __eq__(self, outro):
+        return self._comparar(outro, operator.eq)
+
+    def __ne__(self, outro):
+        return self._comparar(outro, operator.ne)
+
+    def __lt__(self, outro):
+        return self._comparar(outro, operator.lt)
+
+    def __le__(self, outro):
+        return self._comparar(outro, operator.le)
+
+    def __gt__(self, outro):
+        return self._comparar(outro, operator.gt)
+
+    def __ge__(self, outro):
+        return self._comparar(outro, operator.ge)
+
+    def __hash__(self):
+        return hash(self.reais)
+
+
+# Centavos (int) de um valor em reais; instâncias de Dinheiro já estão em centavos
+def para_centavos(valor):
+    if isinstance(valor, Dinheiro):
+        return int(valor)
+    return int(Dinheiro.de_reais(valor))
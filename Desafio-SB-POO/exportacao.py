@@ -0,0 +1,147 @@
+# Importação de Módulos Necessários
+import multiprocessing
+import sys
+from array import array
+from pathlib import Path
+
+# Colunas exportadas: número da conta, código do tipo, valor em centavos e instante em ns
+COLUNAS = (("numero", "q"), ("tipo", "b"), ("valor", "q"), ("instante", "q"))
+CABECALHO_CSV = "numero,tipo,valor,instante_ns\n"
+
+# O cabeçalho .npy é reservado com tamanho fixo e preenchido no fechamento, quando a
+# quantidade de linhas é conhecida: assim as linhas são gravadas à medida que chegam
+_TAMANHO_CABECALHO_NPY = 128
+# Os arrays são gravados na ordem de bytes da máquina, declarada no cabeçalho
+_DESCRITORES_NPY = {"q": ("<" if sys.byteorder == "little" else ">") + "i8", "b": "|i1"}
+
+
+# Cabeçalho do formato .npy (versão 1.0) de um vetor com `quantidade` elementos
+def _cabecalho_npy(tipo, quantidade):
+    dicionario = f"{{'descr': '{_DESCRITORES_NPY[tipo]}', 'fortran_order': False, 'shape': ({quantidade},), }}"
+    preenchimento = _TAMANHO_CABECALHO_NPY - 10 - len(dicionario) - 1
+    return b"\x93NUMPY\x01\x00" + (_TAMANHO_CABECALHO_NPY - 10).to_bytes(2, "little") + (
+        dicionario + " " * preenchimento + "\n"
+    ).encode("latin1")
+
+
+# Definição da classe EscritorCSV
+# Grava blocos de transações (numero, instantes, valores, tipos) como linhas de CSV, com o
+# nome do tipo quando `nomes_tipos` é informado (senão, o código)
+class EscritorCSV:
+    extensao = ".csv"
+
+    def __init__(self, caminho, nomes_tipos=None):
+        self._arquivo = open(caminho, "w", encoding="utf-8", newline="")
+        self._arquivo.write(CABECALHO_CSV)
+        self._nomes_tipos = nomes_tipos
+        self.linhas = 0
+
+    def escrever(self, numero, instantes, valores, tipos):
+        nomes = self._nomes_tipos
+        if nomes is not None:
+            tipos = [nomes[tipo] for tipo in tipos]
+        prefixo = f"{numero},"
+        self._arquivo.write(
+            "".join(f"{prefixo}{tipo},{valor},{instante}\n" for tipo, valor, instante in zip(tipos, valores, instantes))
+        )
+        self.linhas += len(instantes)
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+# Definição da classe EscritorColunas
+# Grava cada coluna em um arquivo .npy próprio dentro de um diretório (numero.npy,
+# tipo.npy, valor.npy, instante.npy), legível com numpy.load(..., mmap_mode="r").
+# Os blocos são gravados direto dos arrays tipados, sem depender do NumPy.
+class EscritorColunas:
+    extensao = ""
+
+    def __init__(self, diretorio, nomes_tipos=None):
+        Path(diretorio).mkdir(parents=True, exist_ok=True)
+        self._arquivos = []
+        for nome, tipo in COLUNAS:
+            arquivo = open(Path(diretorio) / f"{nome}.npy", "wb")
+            arquivo.write(bytes(_TAMANHO_CABECALHO_NPY))
+            self._arquivos.append((arquivo, tipo))
+        self.linhas = 0
+
+    def escrever(self, numero, instantes, valores, tipos):
+        quantidade = len(instantes)
+        colunas = (array("q", [numero]) * quantidade, tipos, valores, instantes)
+        for (arquivo, tipo), coluna in zip(self._arquivos, colunas):
+            if not isinstance(coluna, array) or coluna.typecode != tipo:
+                coluna = array(tipo, coluna)
+            arquivo.write(coluna)
+        self.linhas += quantidade
+
+    def fechar(self):
+        for arquivo, tipo in self._arquivos:
+            arquivo.seek(0)
+            arquivo.write(_cabecalho_npy(tipo, self.linhas))
+            arquivo.close()
+
+
+FORMATOS = {"csv": EscritorCSV, "colunas": EscritorColunas}
+
+
+def _exportar_parte(parte, caminho, formato, nomes_tipos):
+    escritor = FORMATOS[formato](caminho, nomes_tipos)
+    try:
+        for bloco in parte():
+            escritor.escrever(*bloco)
+    finally:
+        escritor.fechar()
+    return escritor.linhas
+
+
+def _executar_em_processo(conexao, parte, caminho, formato, nomes_tipos):
+    try:
+        conexao.send((True, _exportar_parte(parte, caminho, formato, nomes_tipos)))
+    except Exception as erro:
+        conexao.send((False, erro))
+    finally:
+        conexao.close()
+
+
+# Exporta cada parte para um arquivo (CSV) ou diretório (colunas) próprio em `destino`
+# (parte-00000.csv, parte-00001.csv, ...). Uma parte é uma função sem argumentos que devolve
+# os blocos (numero, instantes, valores, tipos). Com `processos` > 1 e fork disponível, as
+# partes são gravadas em paralelo, cada uma em um processo filho que herda a memória do
+# pai; senão, uma após a outra. Devolve [(caminho, linhas), ...].
+def exportar_partes(partes, destino, formato="csv", processos=1, nomes_tipos=None):
+    Path(destino).mkdir(parents=True, exist_ok=True)
+    caminhos = [
+        Path(destino) / f"parte-{indice:05d}{FORMATOS[formato].extensao}" for indice in range(len(partes))
+    ]
+
+    if processos <= 1 or len(partes) <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return [
+            (caminho, _exportar_parte(parte, caminho, formato, nomes_tipos)) for parte, caminho in zip(partes, caminhos)
+        ]
+
+    contexto = multiprocessing.get_context("fork")
+    linhas = []
+    for inicio in range(0, len(partes), processos):
+        execucoes = []
+        for parte, caminho in zip(partes[inicio : inicio + processos], caminhos[inicio : inicio + processos]):
+            local, remota = contexto.Pipe(duplex=False)
+            processo = contexto.Process(
+                target=_executar_em_processo, args=(remota, parte, caminho, formato, nomes_tipos), daemon=True
+            )
+            processo.start()
+            remota.close()
+            execucoes.append((processo, local))
+
+        for processo, local in execucoes:
+            try:
+                sucesso, resultado = local.recv()
+            except EOFError:
+                sucesso, resultado = False, RuntimeError(f"processo de exportação terminou ({processo.exitcode})")
+            processo.join()
+            if not sucesso:
+                raise resultado
+            linhas.append(resultado)
+
+    return list(zip(caminhos, linhas))
+
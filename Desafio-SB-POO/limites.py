@@ -0,0 +1,197 @@
+# Importação de Módulos Necessários
+from collections import deque
+
+from relogio import NS_POR_SEGUNDO, Relogio, limites_do_dia
+
+# Janelas de contagem: o dia do calendário (local), que recomeça à meia-noite, ou as
+# últimas 24 horas, que andam junto com o relógio
+JANELA_DIA = "dia"
+JANELA_24H = "24h"
+DURACAO_24H_NS = 86400 * NS_POR_SEGUNDO
+
+# Quantidade máxima padrão de transações de cada tipo por conta em um mesmo dia,
+# compartilhada pelo sistema orientado a objetos e pelos scripts de Desafio-Sistema-Bancario
+LIMITE_TRANSACOES_DIARIAS = 3
+
+# Motivos devolvidos por PoliticaLimites.verificar quando uma regra é excedida
+EXCEDEU_QUANTIDADE = "quantidade"
+EXCEDEU_VALOR = "valor"
+
+
+# Definição da classe RegraLimite
+# Quantidade máxima e/ou valor total máximo (em centavos) de um tipo de transação em uma janela
+class RegraLimite:
+    __slots__ = ("tipo", "quantidade", "valor", "janela")
+
+    def __init__(self, tipo, quantidade=None, valor=None, janela=JANELA_DIA):
+        if janela not in (JANELA_DIA, JANELA_24H):
+            raise ValueError(f"Janela desconhecida: {janela}")
+        self.tipo = tipo
+        self.quantidade = quantidade
+        self.valor = valor
+        self.janela = janela
+
+    def __repr__(self):
+        return f"<RegraLimite: {self.tipo} quantidade={self.quantidade} valor={self.valor} janela={self.janela}>"
+
+
+# Regras padrão: LIMITE_TRANSACOES_DIARIAS transações por dia de cada um dos tipos
+def regras_diarias(tipos):
+    return [RegraLimite(tipo, quantidade=LIMITE_TRANSACOES_DIARIAS) for tipo in tipos]
+
+
+# Definição da classe JanelaMovel
+# Transações das últimas 24 horas em uma fila de (instante, valor), com a soma mantida a
+# cada entrada e saída: cada transação entra e sai da fila uma única vez (O(1) amortizado)
+class JanelaMovel:
+    __slots__ = ("_fila", "soma")
+
+    def __init__(self):
+        self._fila = deque()
+        self.soma = 0
+
+    def __len__(self):
+        return len(self._fila)
+
+    def expirar(self, agora_ns):
+        fila = self._fila
+        inicio = agora_ns - DURACAO_24H_NS
+        while fila and fila[0][0] <= inicio:
+            self.soma -= fila.popleft()[1]
+
+    def adicionar(self, instante_ns, valor):
+        self._fila.append((instante_ns, valor))
+        self.soma += valor
+
+
+# Definição da classe UsoLimites
+# Uso dos limites por uma conta: o dia dos contadores, [quantidade, valor] de cada tipo
+# nesse dia (em uma lista plana) e, se alguma regra usa a janela de 24h, uma JanelaMovel
+# por tipo. Cada conta guarda o seu; a política só guarda as regras.
+class UsoLimites:
+    __slots__ = ("dia", "contadores", "janelas")
+
+    def __init__(self):
+        self.dia = None
+        self.contadores = None
+        self.janelas = None
+
+
+# Definição da classe PoliticaLimites
+# Regras de limite por tipo de transação, com regras próprias por produto (por exemplo, a
+# classe da conta) e por conta, nesta ordem de prioridade sobre as regras padrão.
+# A verificação e o registro custam O(1) por regra. A virada da meia-noite vale para todas
+# as contas de uma vez: cada uso guarda o dia dos seus contadores e, quando o dia muda, eles
+# são considerados zerados, sem percorrer as contas.
+# A política não tem trava: o chamador protege o uso de cada conta (a trava da conta).
+class PoliticaLimites:
+    def __init__(self, tipos, regras=(), por_produto=None, relogio=None):
+        self._tipos = {tipo: indice for indice, tipo in enumerate(tipos)}
+        self._usa_24h = False
+        self._padrao = self._indexar(regras)
+        self._por_produto = {produto: self._indexar(regras) for produto, regras in (por_produto or {}).items()}
+        self._por_conta = {}
+        self.relogio = relogio or Relogio()
+
+    # {tipo: (regras, ...)}; as janelas móveis só são mantidas se alguma regra as usa
+    def _indexar(self, regras):
+        indexadas = {}
+        for regra in regras:
+            if regra.tipo not in self._tipos:
+                raise ValueError(f"Tipo de transação desconhecido: {regra.tipo}")
+            indexadas.setdefault(regra.tipo, []).append(regra)
+            self._usa_24h = self._usa_24h or regra.janela == JANELA_24H
+        return {tipo: tuple(lista) for tipo, lista in indexadas.items()}
+
+    def definir_regras(self, regras):
+        self._padrao = self._indexar(regras)
+
+    def definir_regras_produto(self, produto, regras):
+        self._por_produto[produto] = self._indexar(regras)
+
+    # Regras próprias de uma conta (None volta a usar as do produto ou as padrão)
+    def definir_regras_conta(self, chave, regras):
+        if regras is None:
+            self._por_conta.pop(chave, None)
+        else:
+            self._por_conta[chave] = self._indexar(regras)
+
+    def regras(self, tipo, chave=None, produto=None):
+        regras = self._por_conta.get(chave) if chave is not None else None
+        if regras is None and produto is not None:
+            regras = self._por_produto.get(produto)
+        if regras is None:
+            regras = self._padrao
+        return regras.get(tipo, ())
+
+    # Devolve None se a transação cabe nos limites, ou o motivo (EXCEDEU_QUANTIDADE ou
+    # EXCEDEU_VALOR). `pendentes` soma (quantidade, valor) já aceitos e ainda não
+    # registrados no uso, como as transações anteriores de um mesmo lote.
+    def verificar(self, uso, tipo, valor, instante_ns=None, chave=None, produto=None, pendentes=(0, 0)):
+        regras = self.regras(tipo, chave, produto)
+        if not regras:
+            return None
+
+        instante_ns = self.relogio.agora_ns() if instante_ns is None else instante_ns
+        for regra in regras:
+            if regra.janela == JANELA_DIA:
+                quantidade, soma = self.uso_do_dia(uso, tipo, instante_ns)
+            else:
+                quantidade, soma = self.uso_24h(uso, tipo, instante_ns)
+            quantidade += pendentes[0]
+            soma += pendentes[1]
+
+            if regra.quantidade is not None and quantidade >= regra.quantidade:
+                return EXCEDEU_QUANTIDADE
+            if regra.valor is not None and soma + valor > regra.valor:
+                return EXCEDEU_VALOR
+        return None
+
+    # Conta uma transação aceita no uso da conta
+    def registrar(self, uso, tipo, valor, instante_ns=None):
+        instante_ns = self.relogio.agora_ns() if instante_ns is None else instante_ns
+        indice = 2 * self._tipos[tipo]
+
+        # Transações de dias anteriores (reaplicadas na recuperação) não contam para hoje
+        dia = self.relogio.dia(instante_ns)
+        if uso.dia is None or dia > uso.dia:
+            uso.dia = dia
+            uso.contadores = [0] * (2 * len(self._tipos))
+        if dia == uso.dia:
+            uso.contadores[indice] += 1
+            uso.contadores[indice + 1] += valor
+
+        if self._usa_24h:
+            if uso.janelas is None:
+                uso.janelas = {}
+            janela = uso.janelas.get(tipo)
+            if janela is None:
+                janela = uso.janelas[tipo] = JanelaMovel()
+            janela.expirar(instante_ns)
+            janela.adicionar(instante_ns, valor)
+
+    # (quantidade, valor) de um tipo no dia de `instante_ns` (hoje, por padrão)
+    def uso_do_dia(self, uso, tipo, instante_ns=None):
+        if uso is None or uso.dia is None:
+            return 0, 0
+        instante_ns = self.relogio.agora_ns() if instante_ns is None else instante_ns
+        if self.relogio.dia(instante_ns) != uso.dia:
+            return 0, 0
+        indice = 2 * self._tipos[tipo]
+        return uso.contadores[indice], uso.contadores[indice + 1]
+
+    # (quantidade, valor) de um tipo nas 24 horas anteriores a `instante_ns` (agora, por padrão)
+    def uso_24h(self, uso, tipo, instante_ns=None):
+        janela = uso.janelas.get(tipo) if uso is not None and uso.janelas is not None else None
+        if janela is None:
+            return 0, 0
+        janela.expirar(self.relogio.agora_ns() if instante_ns is None else instante_ns)
+        return len(janela), janela.soma
+
+    # Primeiro instante cujas transações ainda contam para alguma janela em `instante_ns`:
+    # é a partir dele que um histórico restaurado precisa ser registrado novamente
+    def inicio_das_janelas(self, instante_ns):
+        inicio, _ = limites_do_dia(self.relogio.dia(instante_ns))
+        if self._usa_24h:
+            inicio = min(inicio, instante_ns - DURACAO_24H_NS)
+        return inicio
@@ -0,0 +1,214 @@
+# Importação de Módulos Necessários
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histograma no estilo HDR: valores abaixo de 128 têm um balde cada; acima disso, cada
+# potência de 2 é dividida em 64 baldes, o que mantém o erro relativo abaixo de ~1,6%
+# com uma quantidade fixa de baldes (4096 cobrem qualquer inteiro de 64 bits)
+_BALDES_LINEARES = 128
+_SUBBALDES = 64
+_QUANTIDADE_BALDES = 64 * _SUBBALDES
+PERCENTIS = (0.50, 0.90, 0.99)
+
+
+def _indice(valor):
+    if valor < _BALDES_LINEARES:
+        return valor
+    expoente = valor.bit_length() - 7
+    return expoente * _SUBBALDES + (valor >> expoente)
+
+
+# Maior valor representado pelo balde (o percentil é informado pelo limite superior)
+def _valor_do_balde(indice):
+    if indice < _BALDES_LINEARES:
+        return indice
+    expoente = indice // _SUBBALDES - 1
+    return ((indice - expoente * _SUBBALDES + 1) << expoente) - 1
+
+
+# Definição da classe Histograma
+# Contagens por balde, quantidade, soma e máximo exato de uma série de durações (ns)
+class Histograma:
+    def __init__(self):
+        self.baldes = [0] * _QUANTIDADE_BALDES
+        self.contagem = 0
+        self.soma = 0
+        self.maximo = 0
+
+    def registrar(self, valor):
+        self.baldes[_indice(valor)] += 1
+        self.contagem += 1
+        self.soma += valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def combinar(self, outro):
+        for indice, quantidade in enumerate(outro.baldes):
+            if quantidade:
+                self.baldes[indice] += quantidade
+        self.contagem += outro.contagem
+        self.soma += outro.soma
+        self.maximo = max(self.maximo, outro.maximo)
+
+    def percentil(self, fracao):
+        if not self.contagem:
+            return 0
+        alvo = max(1, round(self.contagem * fracao))
+        acumulado = 0
+        for indice, quantidade in enumerate(self.baldes):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                return min(_valor_do_balde(indice), self.maximo)
+        return self.maximo
+
+    def resumo(self):
+        resumo = {"contagem": self.contagem, "media": self.soma / self.contagem if self.contagem else 0}
+        for fracao in PERCENTIS:
+            resumo[f"p{round(fracao * 100)}"] = self.percentil(fracao)
+        resumo["max"] = self.maximo
+        return resumo
+
+
+# Definição da classe RegistroLatencias
+# Um histograma por função e por thread: o registro de uma duração não adquire trava
+# (só a primeira medição de cada função em cada thread cria e publica seu histograma).
+# Os histogramas das threads são combinados apenas quando o resumo é pedido.
+class RegistroLatencias:
+    def __init__(self):
+        self._local = threading.local()
+        self._trava = threading.Lock()
+        self._histogramas = []  # (nome, histograma) de todas as threads
+
+    def registrar(self, nome, duracao_ns):
+        try:
+            histogramas = self._local.histogramas
+        except AttributeError:
+            histogramas = self._local.histogramas = {}
+
+        histograma = histogramas.get(nome)
+        if histograma is None:
+            histograma = histogramas[nome] = Histograma()
+            with self._trava:
+                self._histogramas.append((nome, histograma))
+        histograma.registrar(duracao_ns)
+
+    def histogramas(self):
+        combinados = {}
+        with self._trava:
+            publicados = list(self._histogramas)
+        for nome, histograma in publicados:
+            combinados.setdefault(nome, Histograma()).combinar(histograma)
+        return dict(sorted(combinados.items()))
+
+    # {função: {"contagem", "media", "p50", "p90", "p99", "max"}}, durações em nanossegundos
+    def resumo(self):
+        return {nome: histograma.resumo() for nome, histograma in self.histogramas().items()}
+
+    def limpar(self):
+        with self._trava:
+            self._histogramas = []
+        self._local = threading.local()
+
+    # Tabela em texto, com as durações em microssegundos
+    def formatar(self):
+        linhas = [f"{'função':<24}{'contagem':>12}{'p50 µs':>12}{'p90 µs':>12}{'p99 µs':>12}{'max µs':>12}"]
+        for nome, resumo in self.resumo().items():
+            linhas.append(
+                f"{nome:<24}{resumo['contagem']:>12}"
+                + "".join(f"{resumo[chave] / 1000:>12.1f}" for chave in ("p50", "p90", "p99", "max"))
+            )
+        return "\n".join(linhas) + "\n"
+
+
+# Definição da classe ContadoresPorThread
+# Contadores por chave sem trava no incremento: cada thread soma no seu próprio dicionário
+# e os dicionários são somados apenas na leitura
+class ContadoresPorThread:
+    def __init__(self):
+        self._local = threading.local()
+        self._trava = threading.Lock()
+        self._contadores = []
+
+    def incrementar(self, chave, quantidade=1):
+        try:
+            contadores = self._local.contadores
+        except AttributeError:
+            contadores = self._local.contadores = {}
+            with self._trava:
+                self._contadores.append(contadores)
+        contadores[chave] = contadores.get(chave, 0) + quantidade
+
+    def valores(self):
+        with self._trava:
+            publicados = list(self._contadores)
+        totais = {}
+        for contadores in publicados:
+            for chave, quantidade in contadores.copy().items():
+                totais[chave] = totais.get(chave, 0) + quantidade
+        return totais
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Formato de texto do Prometheus. `familias` é uma lista de (nome, tipo, ajuda, amostras),
+# com amostras (nome da amostra, rótulos, valor); o nome da amostra é o da família ou
+# o da família com sufixo (_sum, _count)
+def formatar_prometheus(familias):
+    linhas = []
+    for nome, tipo, ajuda, amostras in familias:
+        linhas.append(f"# HELP {nome} {ajuda}")
+        linhas.append(f"# TYPE {nome} {tipo}")
+        for nome_amostra, rotulos, valor in amostras:
+            if rotulos:
+                texto_rotulos = ",".join(f'{chave}="{_escapar(rotulo)}"' for chave, rotulo in rotulos.items())
+                linhas.append(f"{nome_amostra}{{{texto_rotulos}}} {valor}")
+            else:
+                linhas.append(f"{nome_amostra} {valor}")
+    return "\n".join(linhas) + "\n"
+
+
+# Grava o texto das métricas de forma atômica (arquivo temporário + os.replace), por
+# exemplo para o textfile collector do node_exporter
+def gravar_metricas(caminho, texto):
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        arquivo.write(texto)
+    os.replace(temporario, caminho)
+
+
+# Definição da classe ServidorMetricas
+# Servidor HTTP local, em uma thread em segundo plano, que responde GET /metrics com o
+# texto devolvido por `gerar` no momento de cada requisição
+class ServidorMetricas:
+    def __init__(self, gerar, host="127.0.0.1", porta=9100):
+        class Manipulador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                corpo = gerar().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *argumentos):
+                pass
+
+        self._http = ThreadingHTTPServer((host, porta), Manipulador)
+        self._http.daemon_threads = True
+        self._thread = threading.Thread(target=self._http.serve_forever, name="metricas", daemon=True)
+        self._thread.start()
+
+    @property
+    def endereco(self):
+        return self._http.server_address
+
+    def parar(self):
+        self._http.shutdown()
+        self._http.server_close()
+        self._thread.join()
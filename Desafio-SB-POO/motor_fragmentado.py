@@ -0,0 +1,213 @@
+# Importação de Módulos Necessários
+import multiprocessing
+import os
+import threading
+
+from cpf import normalizar_cpf, validar_cpf
+
+CLIENTE_CRIADO = "\n=== Cliente criado com sucesso! ==="
+CLIENTE_DUPLICADO = "\n@@@ Já existe cliente com esse CPF! @@@"
+
+
+# Laço executado em cada processo de fragmento: recebe (método, argumentos) pelo pipe,
+# chama o método no banco local do fragmento e devolve (sucesso, resultado)
+def _executar_fragmento(conexao, fabrica, inicializar, indice):
+    if inicializar is not None:
+        inicializar(indice)
+    banco = fabrica()
+    try:
+        while True:
+            metodo, argumentos = conexao.recv()
+            if metodo is None:
+                break
+
+            try:
+                resposta = (True, getattr(banco, metodo)(*argumentos))
+            except Exception as erro:
+                resposta = (False, erro)
+            conexao.send(resposta)
+    finally:
+        encerrar = getattr(banco, "encerrar", None)
+        if encerrar:
+            encerrar()
+        conexao.close()
+
+
+# Definição da classe MotorFragmentado
+# Distribui as contas entre processos de trabalho pelo número da conta (numero % fragmentos).
+# Cada processo mantém seu próprio banco, criado por `fabrica` (por exemplo, a classe Banco),
+# e as requisições seguem por pipes locais. Lotes são divididos por fragmento e enviados a
+# todos os processos de uma vez, para que sejam aplicados em paralelo.
+# Os processos não usam o WAL nem o SQLite do coordenador (o sistema bancário os desativa no
+# fork); `inicializar(indice)`, chamada em cada processo antes da fábrica, pode ativar os
+# do fragmento, por exemplo um WAL por fragmento.
+class MotorFragmentado:
+    def __init__(self, fabrica, numero_fragmentos=None, inicio_numeracao=1, inicializar=None):
+        numero_fragmentos = numero_fragmentos or os.cpu_count() or 1
+        metodos = multiprocessing.get_all_start_methods()
+        contexto = multiprocessing.get_context("fork" if "fork" in metodos else None)
+
+        self._conexoes = []
+        self._travas = []
+        self._processos = []
+        for indice in range(numero_fragmentos):
+            local, remota = contexto.Pipe()
+            processo = contexto.Process(
+                target=_executar_fragmento,
+                args=(remota, fabrica, inicializar, indice),
+                name=f"fragmento-{indice}",
+                daemon=True,
+            )
+            processo.start()
+            remota.close()
+            self._conexoes.append(local)
+            self._travas.append(threading.Lock())
+            self._processos.append(processo)
+
+        # Números de conta e o mapa CPF -> contas ficam no coordenador
+        self._proximo_numero = inicio_numeracao
+        self._trava_numeracao = threading.Lock()
+        self._clientes = {}
+        self._trava_clientes = threading.Lock()
+        self._encerrado = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.encerrar()
+
+    @property
+    def numero_fragmentos(self):
+        return len(self._conexoes)
+
+    def fragmento(self, numero):
+        return numero % len(self._conexoes)
+
+    def _chamar(self, indice, metodo, *argumentos):
+        with self._travas[indice]:
+            self._conexoes[indice].send((metodo, argumentos))
+            sucesso, resultado = self._conexoes[indice].recv()
+        if not sucesso:
+            raise resultado
+        return resultado
+
+    # Envia a mesma chamada (ou uma chamada por fragmento) a todos os processos e reúne as respostas
+    # (as travas são adquiridas em ordem de fragmento, evitando impasse entre chamadores)
+    def _chamar_todos(self, metodo, argumentos_por_fragmento):
+        indices = sorted(argumentos_por_fragmento)
+        for indice in indices:
+            self._travas[indice].acquire()
+            self._conexoes[indice].send((metodo, argumentos_por_fragmento[indice]))
+
+        respostas = {}
+        erro = None
+        for indice in indices:
+            try:
+                sucesso, resultado = self._conexoes[indice].recv()
+            finally:
+                self._travas[indice].release()
+            if sucesso:
+                respostas[indice] = resultado
+            else:
+                erro = resultado
+        if erro is not None:
+            raise erro
+        return respostas
+
+    # Registra o cliente no coordenador, com o CPF validado e normalizado como no Banco;
+    # ele é criado nos fragmentos junto com suas contas
+    def criar_cliente(self, nome, data_nascimento, cpf, endereco):
+        if not validar_cpf(cpf):
+            return "\n@@@ CPF inválido! @@@"
+        cpf = normalizar_cpf(cpf)
+        with self._trava_clientes:
+            if cpf in self._clientes:
+                return CLIENTE_DUPLICADO
+            self._clientes[cpf] = {"dados": (nome, data_nascimento, cpf, endereco), "contas": []}
+        return CLIENTE_CRIADO
+
+    # Cria a conta no fragmento do seu número (e o cliente, se ainda não estiver nele);
+    # devolve o número da conta (None se o cliente não existir)
+    def criar_conta(self, cpf):
+        cpf = normalizar_cpf(cpf)
+        with self._trava_clientes:
+            cliente = self._clientes.get(cpf)
+        if not cliente:
+            return None
+
+        with self._trava_numeracao:
+            numero = self._proximo_numero
+            self._proximo_numero += 1
+
+        # O cliente já existe no fragmento se outra conta dele caiu no mesmo processo
+        indice = self.fragmento(numero)
+        resultado = self._chamar(indice, "criar_cliente", *cliente["dados"])
+        if resultado not in (CLIENTE_CRIADO, CLIENTE_DUPLICADO):
+            raise RuntimeError(f"Falha ao criar o cliente no fragmento {indice}: {resultado.strip()}")
+        resultado = self._chamar(indice, "criar_conta", cpf, numero)
+        if resultado != numero:
+            raise RuntimeError(f"Falha ao criar a conta {numero} no fragmento {indice}: {resultado!r}")
+
+        with self._trava_clientes:
+            cliente["contas"].append(numero)
+        return numero
+
+    def contas_do_cliente(self, cpf):
+        with self._trava_clientes:
+            cliente = self._clientes.get(normalizar_cpf(cpf))
+            return list(cliente["contas"]) if cliente else []
+
+    def depositar(self, numero, valor):
+        return self._chamar(self.fragmento(numero), "depositar", numero, valor)
+
+    def sacar(self, numero, valor):
+        return self._chamar(self.fragmento(numero), "sacar", numero, valor)
+
+    def saldo(self, numero):
+        return self._chamar(self.fragmento(numero), "saldo", numero)
+
+    def extrato(self, numero):
+        return self._chamar(self.fragmento(numero), "extrato", numero)
+
+    # Mesma interface do Banco; o texto do fragmento chega inteiro pelo pipe, em uma só parte
+    def partes_extrato(self, numero):
+        extrato = self.extrato(numero)
+        return None if extrato is None else [extrato]
+
+    # Aplica operações (tipo, número da conta, valor) divididas por fragmento, em paralelo;
+    # os resultados voltam na ordem recebida
+    def aplicar_lote(self, operacoes):
+        por_fragmento = {}
+        posicoes = {}
+        for posicao, operacao in enumerate(operacoes):
+            indice = self.fragmento(operacao[1])
+            por_fragmento.setdefault(indice, []).append(operacao)
+            posicoes.setdefault(indice, []).append(posicao)
+
+        respostas = self._chamar_todos("aplicar_lote", {indice: (lote,) for indice, lote in por_fragmento.items()})
+
+        resultados = [None] * len(operacoes)
+        for indice, resultados_fragmento in respostas.items():
+            for posicao, resultado in zip(posicoes[indice], resultados_fragmento):
+                resultados[posicao] = resultado
+        return resultados
+
+    # Saldos de todas as contas, reunidos de todos os fragmentos
+    def saldos(self):
+        saldos = {}
+        for resposta in self._chamar_todos("saldos", {indice: () for indice in range(self.numero_fragmentos)}).values():
+            saldos.update(resposta)
+        return dict(sorted(saldos.items()))
+
+    def encerrar(self):
+        if self._encerrado:
+            return
+        self._encerrado = True
+
+        for indice, conexao in enumerate(self._conexoes):
+            with self._travas[indice]:
+                conexao.send((None, ()))
+                conexao.close()
+        for processo in self._processos:
+            processo.join()
@@ -0,0 +1,290 @@
+# Importação de Módulos Necessários
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
+# Políticas de fsync aceitas pelo escritor de log
+FSYNC_NUNCA = "nunca"  # Deixa a sincronização com o disco a cargo do sistema operacional
+FSYNC_POR_LOTE = "lote"  # Executa os.fsync após cada lote gravado
+FSYNC_POR_INTERVALO = "intervalo"  # Executa os.fsync no máximo uma vez por intervalo de flush
+POLITICAS_FSYNC = (FSYNC_NUNCA, FSYNC_POR_LOTE, FSYNC_POR_INTERVALO)
+
+# Marcador usado para pedir o encerramento da thread de gravação
+_SENTINELA = object()
+
+
+# Definição da classe EscritorLogEmLote
+# Mantém uma fila limitada em memória drenada por uma thread em segundo plano,
+# que grava as linhas em lotes sem abrir e fechar o arquivo a cada operação.
+class EscritorLogEmLote:
+    def __init__(
+        self,
+        caminho,
+        tamanho_fila=10_000,
+        tamanho_lote=512,
+        intervalo_flush=0.5,
+        politica_fsync=FSYNC_NUNCA,
+    ):
+        if politica_fsync not in POLITICAS_FSYNC:
+            raise ValueError(f"Política de fsync inválida: {politica_fsync!r}")
+
+        self._caminho = caminho
+        self._tamanho_lote = tamanho_lote
+        self._intervalo_flush = intervalo_flush
+        self._politica_fsync = politica_fsync
+        self._tamanho_fila = tamanho_fila
+        self._iniciar()
+        atexit.register(self.encerrar)
+
+        # Threads não sobrevivem ao fork: o processo filho recomeça com fila e thread próprias
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reiniciar_no_filho)
+
+    def _iniciar(self):
+        self._fila = queue.Queue(maxsize=self._tamanho_fila)
+        self._trava = threading.Lock()
+        self._encerrado = False
+        self._erro = None
+        self.linhas_descartadas = 0
+
+        self._thread = threading.Thread(target=self._drenar, name="escritor-log", daemon=True)
+        self._thread.start()
+
+    def _reiniciar_no_filho(self):
+        if not self._encerrado:
+            self._iniciar()
+
+    @property
+    def caminho(self):
+        return self._caminho
+
+    @property
+    def tamanho_fila(self):
+        return self._fila.qsize()
+
+    # Último erro de gravação (OSError) ou o erro que terminou a thread; None se não houve
+    @property
+    def erro(self):
+        return self._erro
+
+    # Enfileira uma linha; bloqueia quando a fila está cheia (contrapressão), mas falha
+    # em vez de esperar para sempre se a thread de gravação terminou
+    def escrever(self, linha):
+        if self._encerrado:
+            raise RuntimeError("O escritor de log já foi encerrado.")
+        self._enfileirar(linha)
+
+    # Enfileira várias linhas como um único bloco
+    def escrever_lote(self, linhas):
+        if linhas:
+            self.escrever("".join(linhas))
+
+    # Garante que tudo o que foi enfileirado até agora chegou ao arquivo
+    def descarregar(self):
+        if self._encerrado:
+            return
+        concluido = threading.Event()
+        self._enfileirar(concluido)
+        while not concluido.wait(self._intervalo_flush):
+            self._verificar_thread()
+
+    # Grava o que restou na fila e finaliza a thread; pode ser chamado mais de uma vez.
+    # Espera no máximo `timeout` segundos (None: sem limite); devolve False se não terminou.
+    def encerrar(self, timeout=5.0):
+        with self._trava:
+            if self._encerrado:
+                return not self._thread.is_alive()
+            self._encerrado = True
+        try:
+            self._enfileirar(_SENTINELA, timeout)
+        except (queue.Full, RuntimeError):
+            return not self._thread.is_alive()
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _verificar_thread(self):
+        if not self._thread.is_alive():
+            raise RuntimeError(f"A thread de gravação do log terminou: {self._erro!r}")
+
+    # put com espera em fatias, verificando a cada uma se ainda há quem drene a fila
+    def _enfileirar(self, item, timeout=None):
+        prazo = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self._verificar_thread()
+            espera = self._intervalo_flush
+            if prazo is not None:
+                espera = min(espera, prazo - time.monotonic())
+                if espera <= 0:
+                    raise queue.Full
+            try:
+                self._fila.put(item, timeout=espera)
+                return
+            except queue.Full:
+                continue
+
+    def _drenar(self):
+        try:
+            self._drenar_fila()
+        except BaseException as erro:
+            self._erro = erro
+            raise
+
+    # Erros de E/S (disco cheio, arquivo inacessível) não terminam a thread: o lote é
+    # descartado e contado em linhas_descartadas, o erro fica em `erro` e o arquivo é
+    # reaberto no próximo lote
+    def _drenar_fila(self):
+        ultimo_flush = time.monotonic()
+        ultimo_fsync = ultimo_flush
+        pendente = 0  # Linhas gravadas no buffer do arquivo e ainda não descarregadas
+        arquivo = None
+
+        try:
+            while True:
+                try:
+                    item = self._fila.get(timeout=self._intervalo_flush)
+                except queue.Empty:
+                    item = None
+
+                # Monta o lote com o que já estiver disponível na fila
+                lote = []
+                avisos = []
+                encerrar = False
+                while item is not None:
+                    if item is _SENTINELA:
+                        encerrar = True
+                        break
+                    if isinstance(item, threading.Event):
+                        avisos.append(item)
+                    else:
+                        lote.append(item)
+                    if len(lote) >= self._tamanho_lote:
+                        break
+                    try:
+                        item = self._fila.get_nowait()
+                    except queue.Empty:
+                        item = None
+
+                try:
+                    if lote:
+                        pendente += sum(linha.count("\n") or 1 for linha in lote)
+                        if arquivo is None:
+                            arquivo = open(self._caminho, "a", encoding="utf-8")
+                        arquivo.write("".join(lote))
+
+                    agora = time.monotonic()
+                    forcar = encerrar or bool(avisos) or self._politica_fsync == FSYNC_POR_LOTE
+                    if pendente and (forcar or agora - ultimo_flush >= self._intervalo_flush):
+                        ultimo_flush = agora
+                        arquivo.flush()
+                        pendente = 0
+
+                        if self._politica_fsync == FSYNC_POR_LOTE or (
+                            self._politica_fsync == FSYNC_POR_INTERVALO
+                            and (forcar or agora - ultimo_fsync >= self._intervalo_flush)
+                        ):
+                            ultimo_fsync = agora
+                            os.fsync(arquivo.fileno())
+                except OSError as erro:
+                    self._erro = erro
+                    self.linhas_descartadas += pendente
+                    pendente = 0
+                    if arquivo is not None:
+                        arquivo = _fechar_sem_erro(arquivo)
+
+                for aviso in avisos:
+                    aviso.set()
+
+                if encerrar:
+                    break
+        finally:
+            if arquivo is not None:
+                _fechar_sem_erro(arquivo)
+
+
+# Fecha um arquivo cujo buffer pode não ser mais gravável; o conteúdo restante é perdido
+def _fechar_sem_erro(arquivo):
+    try:
+        arquivo.close()
+    except OSError:
+        pass
+    return None
+
+
+# Serializa um registro estruturado como uma única linha JSON (JSONL).
+# O json.dumps escapa quebras de linha, então cada registro ocupa exatamente uma linha.
+def serializar_registro(registro):
+    return json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+# Lê um arquivo JSONL em blocos e devolve os registros um a um, em memória constante.
+# Cada bloco de linhas completas é decodificado com uma única chamada a json.loads,
+# montando um array JSON, o que evita o custo de uma chamada por registro. Se o bloco
+# tiver uma linha inválida (por exemplo, truncada por uma queda), ele é decodificado linha
+# a linha e as linhas inválidas são ignoradas; com `invalidas` (uma lista), elas são
+# acrescentadas a ela.
+def ler_registros_jsonl(caminho, tamanho_bloco=1 << 20, invalidas=None):
+    with open(caminho, "rb") as arquivo:
+        resto = b""
+        while True:
+            bloco = arquivo.read(tamanho_bloco)
+            if not bloco:
+                break
+
+            bloco = resto + bloco
+            fim = bloco.rfind(b"\n")
+            if fim == -1:
+                resto = bloco
+                continue
+
+            resto = bloco[fim + 1 :]
+            yield from _decodificar_linhas(bloco[:fim], invalidas)
+
+        if resto.strip():
+            yield from _decodificar_linhas(resto, invalidas)
+
+
+def _decodificar_linhas(linhas, invalidas=None):
+    linhas = linhas.strip()
+    if not linhas:
+        return []
+    if b"\n\n" in linhas or b"\r" in linhas:
+        linhas = b"\n".join(linha for linha in linhas.splitlines() if linha.strip())
+
+    # Uma linha com vírgulas ("{...},{...}") passaria no array com mais de um registro
+    quantidade = linhas.count(b"\n") + 1
+    try:
+        registros = json.loads(b"[" + linhas.replace(b"\n", b",") + b"]")
+        if len(registros) == quantidade:
+            return registros
+    except ValueError:
+        pass
+    return _decodificar_linha_a_linha(linhas, invalidas)
+
+
+def _decodificar_linha_a_linha(linhas, invalidas):
+    registros = []
+    for linha in linhas.split(b"\n"):
+        try:
+            registros.append(json.loads(linha))
+        except ValueError:
+            if invalidas is not None:
+                invalidas.append(linha)
+    return registros
+
+
+# Reconstrói o saldo (em centavos) de cada conta a partir dos saques e depósitos bem-sucedidos do log
+def reconstruir_saldos(registros):
+    saldos = {}
+    for registro in registros:
+        if registro.get("codigo") != "ok":
+            continue
+
+        operacao = registro["op"]
+        if operacao == "depositar":
+            saldos[registro["conta"]] = saldos.get(registro["conta"], 0) + registro["valor"]
+        elif operacao == "sacar":
+            saldos[registro["conta"]] = saldos.get(registro["conta"], 0) - registro["valor"]
+    return saldos
@@ -0,0 +1,98 @@
+# Importação de Módulos Necessários
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+NS_POR_SEGUNDO = 1_000_000_000
+
+
+# Definição da classe Relogio
+# Relógio de parede em nanossegundos desde a época (inteiros). Além do instante atual,
+# guarda os limites do dia local mais recente consultado, para que a data de um instante
+# seja obtida sem criar objetos datetime enquanto o dia não muda.
+class Relogio:
+    def __init__(self):
+        self._dia = (0, 0, None)  # (início em ns, fim em ns, data)
+
+    def agora_ns(self):
+        return time.time_ns()
+
+    # Data local de um instante (ns)
+    def dia(self, instante_ns):
+        inicio, fim, data = self._dia
+        if inicio <= instante_ns < fim:
+            return data
+        data = datetime.fromtimestamp(instante_ns // NS_POR_SEGUNDO).date()
+        inicio, fim = limites_do_dia(data)
+        self._dia = (inicio, fim, data)
+        return data
+
+    def hoje(self):
+        return self.dia(self.agora_ns())
+
+
+# Definição da classe RelogioGrosso
+# Relógio de baixa resolução: uma thread em segundo plano atualiza o instante a cada `tick`
+# segundos e as leituras apenas devolvem o valor guardado. O instante nunca anda para trás,
+# mesmo que o relógio do sistema seja ajustado, o que mantém os históricos em ordem.
+class RelogioGrosso(Relogio):
+    def __init__(self, tick=0.01):
+        super().__init__()
+        self._tick = tick
+        self._agora = time.time_ns()
+        self._iniciar()
+        # Após um fork a thread não existe no processo filho: é recriada nele
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._iniciar)
+
+    def _iniciar(self):
+        self._thread = threading.Thread(target=self._atualizar, name="relogio", daemon=True)
+        self._thread.start()
+
+    def _atualizar(self):
+        while True:
+            time.sleep(self._tick)
+            self._agora = max(self._agora, time.time_ns())
+
+    def agora_ns(self):
+        return self._agora
+
+
+# Definição da classe RelogioManual
+# Relógio controlado pelo chamador, para testes e benchmarks determinísticos
+class RelogioManual(Relogio):
+    def __init__(self, inicio_ns=0):
+        super().__init__()
+        self._agora = inicio_ns
+
+    def agora_ns(self):
+        return self._agora
+
+    def definir(self, instante_ns):
+        self._agora = instante_ns
+
+    def avancar(self, segundos):
+        self._agora += int(segundos * NS_POR_SEGUNDO)
+
+
+# Instantes (ns desde a época) de início e fim de um dia local
+def limites_do_dia(data):
+    inicio = datetime(data.year, data.month, data.day)
+    return int(inicio.timestamp()) * NS_POR_SEGUNDO, int((inicio + timedelta(days=1)).timestamp()) * NS_POR_SEGUNDO
+
+
+# Definição da classe FormatadorInstantes
+# Formata instantes (ns) com strftime, reaproveitando o texto enquanto o segundo não muda
+class FormatadorInstantes:
+    def __init__(self, formato):
+        self._formato = formato
+        self._ultimo = (None, None)  # (segundo, texto)
+
+    def __call__(self, instante_ns):
+        segundo = instante_ns // NS_POR_SEGUNDO
+        anterior, texto = self._ultimo
+        if segundo != anterior:
+            texto = datetime.fromtimestamp(segundo).strftime(self._formato)
+            self._ultimo = (segundo, texto)
+        return texto
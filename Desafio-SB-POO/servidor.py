@@ -0,0 +1,298 @@
+# Importação de Módulos Necessários
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from cpf import completar_cpf
+from limites import LIMITE_TRANSACOES_DIARIAS
+
+# Protocolo: cada requisição é uma linha UTF-8 com campos separados por TAB
+# (o primeiro campo é o comando) e cada resposta é uma linha com um objeto JSON:
+#   CLIENTE  nome  data_nascimento  cpf  endereco
+#   CONTA    cpf                          -> dados: número da conta
+#   DEPOSITO numero  valor
+#   SAQUE    numero  valor
+#   SALDO    numero                       -> dados: saldo em reais (texto)
+#   EXTRATO  numero                       -> dados: texto do extrato
+#   EXTRATO  numero  cursor  [tamanho]    -> dados: {"linhas": [...], "proximo": cursor ou null}
+#   CONTAS                                -> dados: [[agência, número, titular], ...]
+# Resposta: {"ok": bool, "codigo": str, "mensagem": str, "dados": ...}
+SEPARADOR = "\t"
+# Tamanho máximo de uma linha de requisição; linhas maiores recebem requisicao_invalida
+TAMANHO_MAXIMO_LINHA = 1 << 20
+_LINHA_LONGA = object()
+
+
+# Definição da classe ServidorBancario
+# Atende muitas conexões em um único laço de eventos asyncio. As operações do banco rodam
+# em um conjunto de threads, fora do laço: uma operação que espera o fsync do WAL não
+# trava as demais conexões, e operações concorrentes podem dividir o mesmo fsync (group commit).
+class ServidorBancario:
+    def __init__(self, banco, trabalhadores=32):
+        self._banco = banco
+        self._executor = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="servidor")
+        self._comandos = {
+            "CLIENTE": self._criar_cliente,
+            "CONTA": self._criar_conta,
+            "DEPOSITO": self._depositar,
+            "SAQUE": self._sacar,
+            "SALDO": self._saldo,
+            "EXTRATO": self._extrato,
+            "CONTAS": self._listar_contas,
+        }
+
+    def fechar(self):
+        self._executor.shutdown()
+
+    async def atender(self, leitor, escritor):
+        laco = asyncio.get_running_loop()
+        try:
+            while True:
+                linha = await _ler_linha(leitor)
+                if not linha:
+                    break
+                if linha is _LINHA_LONGA:
+                    resposta = _codificar(
+                        _resposta(False, "requisicao_invalida", f"Linha maior que {TAMANHO_MAXIMO_LINHA} bytes")
+                    )
+                else:
+                    resposta = await laco.run_in_executor(self._executor, self.processar, linha)
+
+                if isinstance(resposta, bytes):
+                    escritor.write(resposta)
+                    await escritor.drain()
+                    continue
+                # Resposta em partes (extrato completo): cada parte é gerada no conjunto de
+                # threads e enviada antes da próxima, sem montar a resposta inteira
+                while True:
+                    parte = await laco.run_in_executor(self._executor, next, resposta, None)
+                    if parte is None:
+                        break
+                    escritor.write(parte)
+                    await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    # Processa uma linha de requisição e devolve a linha de resposta (bytes) ou, para o
+    # extrato completo, um iterador com os pedaços da linha de resposta
+    def processar(self, linha):
+        try:
+            campos = linha.decode("utf-8").rstrip("\r\n").split(SEPARADOR)
+        except UnicodeDecodeError as erro:
+            return _codificar(_resposta(False, "requisicao_invalida", f"Requisição não é UTF-8 válido: {erro}"))
+        comando = self._comandos.get(campos[0].upper())
+
+        if comando is None:
+            resposta = _resposta(False, "comando_invalido", f"Comando desconhecido: {campos[0]}")
+        else:
+            try:
+                resposta = comando(*campos[1:])
+            except (TypeError, ValueError, ArithmeticError) as erro:
+                resposta = _resposta(False, "requisicao_invalida", str(erro))
+
+        return _codificar(resposta) if isinstance(resposta, dict) else resposta
+
+    def _resultado(self, mensagem, dados=None):
+        codigo = self._banco.codigo_resultado(mensagem)
+        return _resposta(codigo == "ok", codigo, mensagem.strip(), dados)
+
+    def _criar_cliente(self, nome, data_nascimento, cpf, endereco):
+        return self._resultado(self._banco.criar_cliente(nome, data_nascimento, cpf, endereco))
+
+    def _criar_conta(self, cpf):
+        numero = self._banco.criar_conta(cpf)
+        if numero is None:
+            return _resposta(False, "cliente_inexistente", "Cliente não encontrado!")
+        return _resposta(True, "ok", "Conta criada com sucesso!", numero)
+
+    def _depositar(self, numero, valor):
+        return self._resultado(self._banco.depositar(int(numero), valor))
+
+    def _sacar(self, numero, valor):
+        return self._resultado(self._banco.sacar(int(numero), valor))
+
+    def _saldo(self, numero):
+        saldo = self._banco.saldo(int(numero))
+        if saldo is None:
+            return _resposta(False, "conta_inexistente", "Conta não encontrada!")
+        return _resposta(True, "ok", "", str(saldo))
+
+    def _extrato(self, numero, cursor=None, tamanho_pagina=50):
+        if cursor is not None:
+            pagina = self._banco.pagina_extrato(int(numero), int(cursor), int(tamanho_pagina))
+            if pagina is None:
+                return _resposta(False, "conta_inexistente", "Conta não encontrada!")
+            linhas, proximo = pagina
+            return _resposta(True, "ok", "", {"linhas": linhas, "proximo": proximo})
+
+        partes = self._banco.partes_extrato(int(numero))
+        if partes is None:
+            return _resposta(False, "conta_inexistente", "Conta não encontrada!")
+        return _codificar_em_partes(_resposta(True, "ok", ""), partes)
+
+    def _listar_contas(self):
+        return _resposta(True, "ok", "", self._banco.listar_contas())
+
+
+def _resposta(ok, codigo, mensagem, dados=None):
+    return {"ok": ok, "codigo": codigo, "mensagem": mensagem, "dados": dados}
+
+
+def _codificar(resposta):
+    return (json.dumps(resposta, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+# Linha de resposta cujo campo "dados" é um texto recebido em partes, gerada em pedaços
+# (bytes): cada parte é escapada para JSON separadamente, sem juntar o texto inteiro
+def _codificar_em_partes(resposta, partes):
+    inicio = json.dumps({**resposta, "dados": ""}, ensure_ascii=False, separators=(",", ":"))
+    yield inicio[:-2].encode("utf-8")
+    for parte in partes:
+        yield json.dumps(parte, ensure_ascii=False)[1:-1].encode("utf-8")
+    yield b'"}\n'
+
+
+# Lê uma linha (b"" no fim da conexão). Uma linha maior que o limite do leitor é descartada
+# até o fim, para que o restante dela não seja lido como outra requisição, e devolve _LINHA_LONGA.
+async def _ler_linha(leitor):
+    try:
+        return await leitor.readuntil(b"\n")
+    except asyncio.IncompleteReadError as erro:
+        return erro.partial
+    except asyncio.LimitOverrunError as erro:
+        descartar = erro.consumed
+
+    while True:
+        await leitor.readexactly(descartar)
+        try:
+            await leitor.readuntil(b"\n")
+            return _LINHA_LONGA
+        except asyncio.IncompleteReadError:
+            return _LINHA_LONGA
+        except asyncio.LimitOverrunError as erro:
+            descartar = erro.consumed
+
+
+async def servir(banco, host="127.0.0.1", porta=8765):
+    servidor = ServidorBancario(banco)
+    try:
+        async with await asyncio.start_server(servidor.atender, host, porta, limit=TAMANHO_MAXIMO_LINHA) as tcp:
+            print(f"Servidor bancário ouvindo em {host}:{porta}")
+            await tcp.serve_forever()
+    finally:
+        servidor.fechar()
+
+
+# Inicia o servidor até ser interrompido (Ctrl+C)
+def executar_servidor(banco, host="127.0.0.1", porta=8765):
+    try:
+        asyncio.run(servir(banco, host, int(porta)))
+    except KeyboardInterrupt:
+        print("\nServidor encerrado.")
+
+
+# Gerador de carga: cada cliente simulado abre uma conexão, cria um cliente e uma conta e
+# envia uma sequência de requisições, medindo a latência de cada uma. Para que depósitos e
+# saques sejam aceitos (e não recusados pelo limite diário), o cliente abre uma nova conta
+# quando a atual esgota `limite_diario` transações de um tipo, e só saca o que depositou,
+# dentro do limite por saque.
+async def _cliente_de_carga(host, porta, indice, requisicoes, latencias, codigos, limite_diario):
+    leitor, escritor = await asyncio.open_connection(host, porta, limit=1 << 20)
+
+    async def enviar(*campos):
+        inicio = time.perf_counter_ns()
+        escritor.write((SEPARADOR.join(str(campo) for campo in campos) + "\n").encode("utf-8"))
+        resposta = json.loads(await leitor.readline())
+        latencias.append(time.perf_counter_ns() - inicio)
+        codigos[resposta["codigo"]] += 1
+        return resposta
+
+    cpf = completar_cpf(f"{indice + 1:09d}")
+    await enviar("CLIENTE", f"Cliente {indice}", "01/01/2000", cpf, "Rua A")
+    numero = (await enviar("CONTA", cpf))["dados"]
+    usos = {"DEPOSITO": 0, "SAQUE": 0}
+    saldo = 0
+
+    gerador = random.Random(indice)
+    for _ in range(requisicoes):
+        sorteio = gerador.random()
+        if sorteio < 0.7:
+            comando = "SAQUE" if sorteio >= 0.4 and saldo > 0 else "DEPOSITO"
+            if usos[comando] >= limite_diario:
+                numero = (await enviar("CONTA", cpf))["dados"]
+                usos = {"DEPOSITO": 0, "SAQUE": 0}
+                saldo = 0
+                comando = "DEPOSITO"
+            # Saques de até R$ 500, o limite por saque da conta corrente
+            valor = gerador.randint(1, 500) if comando == "DEPOSITO" else gerador.randint(1, min(saldo, 500))
+            if (await enviar(comando, numero, valor))["ok"]:
+                usos[comando] += 1
+                saldo += valor if comando == "DEPOSITO" else -valor
+        elif sorteio < 0.95:
+            await enviar("SALDO", numero)
+        else:
+            await enviar("EXTRATO", numero)
+
+    escritor.close()
+    await escritor.wait_closed()
+
+
+# Devolve as medidas e, em "codigos", a quantidade de respostas de cada código (ok,
+# limite_diario, ...), para conferir quantas operações foram de fato aceitas
+async def gerar_carga(
+    host="127.0.0.1", porta=8765, clientes=100, requisicoes=1000, limite_diario=LIMITE_TRANSACOES_DIARIAS
+):
+    latencias = []
+    codigos = Counter()
+    inicio = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _cliente_de_carga(host, porta, indice, requisicoes, latencias, codigos, limite_diario)
+            for indice in range(clientes)
+        )
+    )
+    duracao = time.perf_counter() - inicio
+
+    latencias.sort()
+
+    def percentil(p):
+        return latencias[min(len(latencias) - 1, int(len(latencias) * p))] / 1e6
+
+    return {
+        "requisicoes": len(latencias),
+        "requisicoes_por_segundo": len(latencias) / duracao,
+        "p50_ms": percentil(0.50),
+        "p99_ms": percentil(0.99),
+        "max_ms": latencias[-1] / 1e6,
+        "codigos": dict(codigos),
+    }
+
+
+# Execução do gerador de carga contra um servidor já iniciado:
+#   python servidor.py --clientes 200 --requisicoes 500
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gerador de carga para o servidor bancário")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--clientes", type=int, default=100)
+    parser.add_argument("--requisicoes", type=int, default=1000)
+    # Deve ser o limite diário configurado no servidor (limites.LIMITE_TRANSACOES_DIARIAS por padrão)
+    parser.add_argument("--limite-diario", type=int, default=LIMITE_TRANSACOES_DIARIAS)
+    argumentos = parser.parse_args()
+
+    resultado = asyncio.run(
+        gerar_carga(
+            argumentos.host, argumentos.porta, argumentos.clientes, argumentos.requisicoes, argumentos.limite_diario
+        )
+    )
+    codigos = resultado.pop("codigos")
+    for chave, valor in resultado.items():
+        print(f"{chave:<28}{valor:>14,.2f}")
+    for codigo, quantidade in sorted(codigos.items()):
+        print(f"codigo {codigo:<21}{quantidade:>14,}")
@@ -0,0 +1,234 @@
+# Importação de Módulos Necessários
+import mmap
+import os
+import struct
+import sys
+import threading
+import traceback
+import zlib
+from array import array
+from pathlib import Path
+
+from wal import sincronizar_diretorio
+
+# Formato binário do snapshot (inteiros little-endian):
+#   cabeçalho: assinatura, versão, LSN inicial do WAL, próximo número de conta,
+#              quantidade de clientes, quantidade de contas
+#   clientes:  4 textos (nome, data de nascimento, CPF, endereço), cada um com tamanho u32 + UTF-8
+#   contas:    número, saldo, limite (-1 se não houver), LSN do saldo, LSN do histórico,
+#              quantidade de transações, agência e CPF (textos), e as três colunas do
+#              histórico em bytes brutos (instantes int64, valores int64, tipos int8)
+#   rodapé:    CRC32 de clientes e contas
+# Na versão 2 os instantes estão em nanossegundos desde a época; snapshots da versão 1
+# (instantes em segundos) continuam legíveis e são convertidos na leitura.
+ASSINATURA = b"SBPOO\x00\x00\x01"
+VERSAO = 2
+_VERSOES_LEGIVEIS = (1, 2)
+_NS_POR_SEGUNDO = 1_000_000_000
+_CABECALHO = struct.Struct("<8sIQQQQ")
+_CONTA = struct.Struct("<QqqQQQ")
+_TAMANHO = struct.Struct("<I")
+_CRC = struct.Struct("<I")
+_PREFIXO = "snapshot-"
+_SUFIXO = ".bin"
+
+
+def _texto(valor):
+    dados = str(valor).encode("utf-8")
+    return _TAMANHO.pack(len(dados)) + dados
+
+
+# Definição da classe _ArquivoComCrc
+# Acumula o CRC32 de tudo o que é gravado, para validar o snapshot na leitura
+class _ArquivoComCrc:
+    def __init__(self, arquivo):
+        self._arquivo = arquivo
+        self.crc = 0
+
+    def write(self, dados):
+        self.crc = zlib.crc32(dados, self.crc)
+        self._arquivo.write(dados)
+
+
+# Grava um snapshot em `diretorio`, de forma atômica (arquivo temporário + os.replace, com
+# fsync do arquivo e, depois da renomeação, do diretório).
+# `clientes` é uma lista de tuplas (nome, data_nascimento, cpf, endereco) e `contas` um iterável
+# de tuplas (numero, agencia, cpf, limite, saldo, lsn_saldo, lsn_historico, instantes, valores, tipos),
+# consumido em fluxo. Devolve o caminho do arquivo gravado.
+def gravar_snapshot(diretorio, lsn_inicial, proximo_numero, clientes, contas):
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    destino = diretorio / f"{_PREFIXO}{lsn_inicial:020d}{_SUFIXO}"
+    temporario = destino.with_suffix(".tmp")
+
+    with open(temporario, "wb") as arquivo:
+        # O cabeçalho é regravado no fim, com a quantidade real de contas
+        arquivo.write(b"\x00" * _CABECALHO.size)
+        saida = _ArquivoComCrc(arquivo)
+
+        for cliente in clientes:
+            saida.write(b"".join(_texto(campo) for campo in cliente))
+
+        quantidade_contas = 0
+        for numero, agencia, cpf, limite, saldo, lsn_saldo, lsn_historico, instantes, valores, tipos in contas:
+            saida.write(
+                _CONTA.pack(numero, saldo, -1 if limite is None else limite, lsn_saldo, lsn_historico, len(tipos))
+                + _texto(agencia)
+                + _texto(cpf)
+            )
+            saida.write(instantes.tobytes())
+            saida.write(valores.tobytes())
+            saida.write(tipos.tobytes())
+            quantidade_contas += 1
+
+        cabecalho = _CABECALHO.pack(ASSINATURA, VERSAO, lsn_inicial, proximo_numero, len(clientes), quantidade_contas)
+        arquivo.write(_CRC.pack(saida.crc))
+        arquivo.seek(0)
+        arquivo.write(cabecalho)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+
+    os.replace(temporario, destino)
+    sincronizar_diretorio(destino)
+    return destino
+
+
+# Definição da classe Snapshot
+# Resultado da leitura de um snapshot mapeado em memória (mmap)
+class Snapshot:
+    def __init__(self, caminho, lsn_inicial, proximo_numero, clientes, contas):
+        self.caminho = caminho
+        self.lsn_inicial = lsn_inicial
+        self.proximo_numero = proximo_numero
+        self.clientes = clientes
+        self.contas = contas
+
+
+def _ler_texto(memoria, posicao):
+    (tamanho,) = _TAMANHO.unpack_from(memoria, posicao)
+    inicio = posicao + _TAMANHO.size
+    return str(memoria[inicio : inicio + tamanho], "utf-8"), inicio + tamanho
+
+
+def _ler_coluna(tipo, memoria, posicao, quantidade):
+    coluna = array(tipo)
+    fim = posicao + quantidade * coluna.itemsize
+    coluna.frombytes(memoria[posicao:fim])
+    return coluna, fim
+
+
+# Lê e valida um snapshot; levanta ValueError se estiver corrompido
+def ler_snapshot(caminho):
+    with open(caminho, "rb") as arquivo, mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        memoria = memoryview(mapa)
+        try:
+            if len(memoria) < _CABECALHO.size + _CRC.size:
+                raise ValueError(f"Snapshot incompleto: {caminho}")
+
+            assinatura, versao, lsn_inicial, proximo_numero, quantidade_clientes, quantidade_contas = (
+                _CABECALHO.unpack_from(memoria, 0)
+            )
+            if assinatura != ASSINATURA or versao not in _VERSOES_LEGIVEIS:
+                raise ValueError(f"Arquivo não é um snapshot válido: {caminho}")
+
+            fim_dados = len(memoria) - _CRC.size
+            if _CRC.unpack_from(memoria, fim_dados)[0] != zlib.crc32(memoria[_CABECALHO.size : fim_dados]):
+                raise ValueError(f"Snapshot corrompido (CRC inválido): {caminho}")
+
+            posicao = _CABECALHO.size
+            clientes = []
+            for _ in range(quantidade_clientes):
+                campos = []
+                for _ in range(4):
+                    campo, posicao = _ler_texto(memoria, posicao)
+                    campos.append(campo)
+                clientes.append(tuple(campos))
+
+            contas = []
+            for _ in range(quantidade_contas):
+                numero, saldo, limite, lsn_saldo, lsn_historico, quantidade = _CONTA.unpack_from(memoria, posicao)
+                posicao += _CONTA.size
+                agencia, posicao = _ler_texto(memoria, posicao)
+                cpf, posicao = _ler_texto(memoria, posicao)
+                instantes, posicao = _ler_coluna("q", memoria, posicao, quantidade)
+                valores, posicao = _ler_coluna("q", memoria, posicao, quantidade)
+                tipos, posicao = _ler_coluna("b", memoria, posicao, quantidade)
+                if versao == 1:
+                    instantes = array("q", (instante * _NS_POR_SEGUNDO for instante in instantes))
+                contas.append(
+                    (
+                        numero,
+                        agencia,
+                        cpf,
+                        None if limite == -1 else limite,
+                        saldo,
+                        lsn_saldo,
+                        lsn_historico,
+                        instantes,
+                        valores,
+                        tipos,
+                    )
+                )
+
+            if posicao != fim_dados:
+                raise ValueError(f"Snapshot inconsistente com o cabeçalho: {caminho}")
+        finally:
+            memoria.release()
+
+    return Snapshot(caminho, lsn_inicial, proximo_numero, clientes, contas)
+
+
+# Snapshots do diretório, do mais recente (maior LSN) para o mais antigo
+def listar_snapshots(diretorio):
+    diretorio = Path(diretorio)
+    if not diretorio.is_dir():
+        return []
+    return sorted(diretorio.glob(f"{_PREFIXO}*{_SUFIXO}"), reverse=True)
+
+
+# Carrega o snapshot válido mais recente (None se não houver nenhum)
+def carregar_snapshot_mais_recente(diretorio):
+    for caminho in listar_snapshots(diretorio):
+        try:
+            return ler_snapshot(caminho)
+        except ValueError:
+            continue
+    return None
+
+
+# Mantém apenas os `manter` snapshots mais recentes; devolve o menor LSN inicial entre os
+# mantidos (None se não houver nenhum), a partir do qual o WAL ainda é necessário
+def remover_snapshots_antigos(diretorio, manter=2):
+    snapshots = listar_snapshots(diretorio)
+    for caminho in snapshots[manter:]:
+        caminho.unlink()
+    mantidos = snapshots[:manter]
+    return int(mantidos[-1].name[len(_PREFIXO) : -len(_SUFIXO)]) if mantidos else None
+
+
+# Definição da classe SnapshotsPeriodicos
+# Thread em segundo plano que chama `gravar` a cada `intervalo` segundos. Uma gravação que
+# falha (disco cheio, diretório inacessível) não termina a thread: o erro é escrito no
+# stderr, fica em `erro`, é contado em `falhas` e a próxima tentativa vem no intervalo seguinte.
+class SnapshotsPeriodicos:
+    def __init__(self, gravar, intervalo=300):
+        self._gravar = gravar
+        self._intervalo = intervalo
+        self._parar = threading.Event()
+        self.erro = None
+        self.falhas = 0
+        self._thread = threading.Thread(target=self._executar, name="snapshots", daemon=True)
+        self._thread.start()
+
+    def _executar(self):
+        while not self._parar.wait(self._intervalo):
+            try:
+                self._gravar()
+            except Exception as erro:
+                self.erro = erro
+                self.falhas += 1
+                sys.stderr.write(f"Falha ao gravar o snapshot periódico:\n{traceback.format_exc()}")
+
+    def parar(self):
+        self._parar.set()
+        self._thread.join()
@@ -0,0 +1,31 @@
+# Importação de Módulos Necessários
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_PATH = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_PATH))
+
+from registro_log import EscritorLogEmLote  # noqa: E402
+
+
+# Sistema bancário carregado como módulo novo a cada teste (o nome do arquivo não é um
+# identificador válido), com o log redirecionado para /dev/null
+@pytest.fixture
+def sistema():
+    spec = importlib.util.spec_from_file_location("sistema_bancario", ROOT_PATH / "01-Sistema_Bancario_POO.py")
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    modulo.escritor_log.encerrar()
+    modulo.escritor_log = EscritorLogEmLote(os.devnull)
+
+    yield modulo
+
+    modulo.escritor_log.encerrar()
+    if modulo.wal is not None:
+        modulo.wal.fechar()
+    if modulo.armazenamento is not None:
+        modulo.armazenamento.fechar()
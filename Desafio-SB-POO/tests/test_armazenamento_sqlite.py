@@ -0,0 +1,77 @@
+# Importação de Módulos Necessários
+import sqlite3
+
+import pytest
+
+import armazenamento_sqlite
+from cpf import completar_cpf
+
+CPF = completar_cpf("529982247")
+
+
+def test_saldo_e_historico_na_mesma_transacao(sistema, tmp_path, monkeypatch):
+    armazenamento = sistema.ativar_armazenamento(tmp_path / "banco.sqlite3", leitores=1)
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+    numero = banco.criar_conta(CPF)
+    banco.depositar(numero, "10")
+
+    # Se a inserção do histórico falha, a atualização do saldo também é desfeita
+    monkeypatch.setattr(armazenamento_sqlite, "_INSERIR_TRANSACAO", "INSERT INTO inexistente VALUES (?, ?, ?, ?)")
+    with pytest.raises(sqlite3.OperationalError):
+        banco.depositar(numero, "5")
+    monkeypatch.undo()
+
+    banco.aplicar_lote([("Deposito", numero, "2"), ("Saque", numero, "1")])
+    assert armazenamento.ler_contas()[0][4] == int(banco.saldo(numero)) == 1100
+    assert list(armazenamento.ler_historicos()[numero][1]) == list(banco.conta(numero).historico._valores)
+
+
+def test_falha_no_sqlite_nao_chega_ao_wal(sistema, tmp_path, monkeypatch):
+    sistema.ativar_wal(tmp_path / "banco.wal")
+    sistema.ativar_armazenamento(tmp_path / "banco.sqlite3", leitores=1)
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+    numero = banco.criar_conta(CPF)
+    banco.depositar(numero, "10")
+
+    monkeypatch.setattr(armazenamento_sqlite, "_INSERIR_TRANSACAO", "INSERT INTO inexistente VALUES (?, ?, ?, ?)")
+    with pytest.raises(sqlite3.OperationalError):
+        banco.depositar(numero, "5")
+    monkeypatch.undo()
+    banco.depositar(numero, "1")
+
+    # O depósito que falhou no SQLite não é reaplicado na recuperação pelo WAL
+    sistema.wal.fechar()
+    recuperado = sistema.recuperar_banco(tmp_path / "banco.wal")
+    assert int(recuperado.saldo(numero)) == int(banco.saldo(numero)) == 1100
+    assert len(recuperado.conta(numero).historico) == 2
+
+
+def test_consultas_pelos_indices_coincidem_com_a_memoria(sistema, tmp_path):
+    armazenamento = sistema.ativar_armazenamento(tmp_path / "banco.sqlite3", leitores=1)
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+    numero = banco.criar_conta(CPF)
+    banco.aplicar_lote([("Deposito", numero, "10"), ("Deposito", numero, "20"), ("Saque", numero, "5")])
+    banco.depositar(numero, "1")
+    banco.sacar(numero, "2")
+
+    sqlite = sistema.carregar_banco_sqlite(armazenamento)
+    assert isinstance(banco.consultas, sistema.ConsultasMemoria) and sqlite.consultas is armazenamento
+
+    for fonte in (banco, sqlite):
+        paginas, cursor = [], 0
+        while cursor is not None:
+            linhas, cursor = fonte.pagina_extrato(numero, cursor, tamanho_pagina=2)
+            paginas.append(linhas)
+        assert [len(linhas) for linhas in paginas] == [2, 2, 1]
+        assert sistema.CABECALHO_RELATORIO + "".join(sum(paginas, [])) == banco.extrato(numero)
+        assert (fonte.transacoes_do_dia(numero, "Deposito"), fonte.transacoes_do_dia(numero, "Saque")) == (3, 2)
+    assert banco.pagina_extrato(numero, 0, 10) == sqlite.pagina_extrato(numero, 0, 10)
+    assert banco.pagina_extrato(numero, 0, 10, fim=0) == sqlite.pagina_extrato(numero, 0, 10, fim=0) == ([], None)
+
+    # A contagem do dia é respondida só pelo índice (numero, instante, tipo)
+    with armazenamento.leitor() as conexao:
+        plano = conexao.execute(f"EXPLAIN QUERY PLAN {armazenamento_sqlite._CONTAR}", (numero, 0, 0, 1)).fetchall()
+    assert "COVERING INDEX idx_transacoes_conta_instante" in str(plano)
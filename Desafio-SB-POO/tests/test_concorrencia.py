@@ -0,0 +1,54 @@
+# Importação de Módulos Necessários
+import sys
+import threading
+
+import pytest
+
+from cpf import completar_cpf
+
+THREADS = 8
+
+
+@pytest.fixture
+def trocas_frequentes():
+    anterior = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(anterior)
+
+
+def _em_paralelo(funcao):
+    barreira = threading.Barrier(THREADS)
+    resultados = [None] * THREADS
+
+    def executar(indice):
+        barreira.wait()
+        resultados[indice] = funcao()
+
+    threads = [threading.Thread(target=executar, args=(indice,)) for indice in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return resultados
+
+
+def test_saques_concorrentes_nao_deixam_o_saldo_negativo(sistema, trocas_frequentes):
+    cliente = sistema.PessoaFisica("Ana", "01/01/2000", completar_cpf("529982247"), "Rua A")
+    conta = sistema.Conta(cliente)
+    conta.depositar("10")
+
+    resultados = _em_paralelo(lambda: [conta.sacar("0.10") for _ in range(50)])
+    sucessos = sum(resultado == "\n=== Saque realizado com sucesso! ===" for lista in resultados for resultado in lista)
+    assert sucessos == 100
+    assert int(conta.saldo) == 0
+
+
+def test_numeros_de_conta_unicos_entre_threads(sistema, trocas_frequentes):
+    gerador = sistema.GeradorNumeros(10)
+    resultados = _em_paralelo(lambda: [gerador.proximo() for _ in range(500)] + list(gerador.reservar_bloco(100)))
+
+    numeros = [numero for lista in resultados for numero in lista]
+    assert sorted(numeros) == list(range(10, 10 + THREADS * 600))
+    gerador.ajustar(5)
+    assert gerador.atual == 10 + THREADS * 600
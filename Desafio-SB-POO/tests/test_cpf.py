@@ -0,0 +1,33 @@
+# Importação de Módulos Necessários
+import pytest
+
+import cpf as modulo_cpf
+from cpf import completar_cpf, normalizar_cpf, validar_cpf, validar_cpfs
+
+CPF = completar_cpf("529982247")
+FORMATADO = f"{CPF[:3]}.{CPF[3:6]}.{CPF[6:9]}-{CPF[9:]}"
+
+
+def test_cliente_criado_no_banco_guarda_o_cpf_normalizado(sistema):
+    banco = sistema.Banco()
+    assert banco.criar_cliente("Ana", "01/01/2000", f" {FORMATADO} ", "Rua A") == "\n=== Cliente criado com sucesso! ==="
+
+    assert banco.clientes.buscar(CPF).cpf == CPF
+    assert banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A") == "\n@@@ Já existe cliente com esse CPF! @@@"
+
+
+def test_validacao_em_lote_igual_a_escalar(monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(modulo_cpf, "TAMANHO_BLOCO_VALIDACAO", 3)
+    cpfs = [CPF, FORMATADO, "11111111111", CPF[:-1] + str((int(CPF[-1]) + 1) % 10), "123", "５２９９８２２４７２５", ""]
+
+    esperado = [validar_cpf(cpf) for cpf in cpfs]
+    assert esperado == [True, True, False, False, False, False, False]
+    assert validar_cpfs(cpfs).tolist() == esperado
+
+    codigos = np.array([int(CPF), 11111111111, -int(CPF), 10**11 + int(CPF), int(completar_cpf("000000001"))])
+    assert validar_cpfs(codigos).tolist() == [True, False, False, False, True]
+    assert validar_cpfs(np.array([normalizar_cpf(cpf) for cpf in cpfs[:4]], "S11")).tolist() == esperado[:4]
+
+    monkeypatch.setattr(modulo_cpf, "np", None)
+    assert validar_cpfs(cpfs) == esperado
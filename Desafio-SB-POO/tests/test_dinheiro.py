@@ -0,0 +1,78 @@
+# Importação de Módulos Necessários
+from decimal import Decimal
+
+import pytest
+
+from cpf import completar_cpf
+from dinheiro import CENTAVOS_MAXIMO, CENTAVOS_MINIMO, Dinheiro, para_centavos
+
+CPF = completar_cpf("529982247")
+
+
+def test_conversao_exata_em_centavos():
+    assert int(Dinheiro.de_reais("10,50")) == 1050
+    assert int(Dinheiro.de_reais(0.1)) == 10
+    assert int(Dinheiro.de_reais("92233720368547758.07")) == CENTAVOS_MAXIMO
+    assert int(Dinheiro.de_reais("-92233720368547758.08")) == CENTAVOS_MINIMO
+
+
+@pytest.mark.parametrize(
+    "valor", ["1e30", "1e999999", "-1e999999", "92233720368547758.08", "-92233720368547758.09", "0.001", "abc", "nan"]
+)
+def test_valores_fora_da_faixa_ou_invalidos(valor):
+    with pytest.raises(ValueError):
+        Dinheiro.de_reais(valor)
+
+
+def test_aritmetica_continua_em_dinheiro():
+    dez = Dinheiro.de_reais("10.00")
+
+    diferenca = dez - Dinheiro.de_reais("1")
+    assert isinstance(diferenca, Dinheiro) and para_centavos(diferenca) == 900
+    assert para_centavos(dez + 1) == 1100 and para_centavos(5 - dez) == -500
+    assert isinstance(sum([dez, dez]), Dinheiro) and int(sum([dez, dez])) == 2000
+    assert int(dez * 3) == 3000 and int(-dez) == -1000 and float(dez) == 10.0
+    with pytest.raises(ValueError):
+        dez + 0.001
+    for operacao in (lambda: dez / 2, lambda: dez // 2, lambda: dez % 3, lambda: dez**2, lambda: dez * 1.5):
+        with pytest.raises(TypeError):
+            operacao()
+
+
+def test_comparacoes_em_reais():
+    dez = Dinheiro.de_reais("10.00")
+
+    assert dez == 10 and dez == 10.0 and dez == Decimal("10") and dez != 1000
+    assert dez < 50 and not dez > 50 and dez >= 10 and dez > 9.99
+    assert dez == Dinheiro(1000) and dez < Dinheiro.de_reais("10.01")
+    assert hash(dez) == hash(10) and {dez: 1}[10] == 1
+    assert dez != float("nan") and not dez < float("nan")
+
+
+def test_deposito_fora_da_faixa_nao_altera_o_saldo(sistema):
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+    numero = banco.criar_conta(CPF)
+
+    # Operação avulsa e lote tratam o valor inválido da mesma forma
+    assert banco.codigo_resultado(banco.depositar(numero, "1e30")) == "valor_invalido"
+    assert banco.codigo_resultado(banco.sacar(numero, "abc")) == "valor_invalido"
+    resultados = banco.aplicar_lote([("Deposito", numero, "1e30"), ("Deposito", numero, "10")])
+    assert "inválido" in resultados[0] and "sucesso" in resultados[1]
+    assert int(banco.saldo(numero)) == 1000
+
+    # O saldo também não passa do maior valor representável em 64 bits
+    assert "sucesso" in banco.depositar(numero, "92233720368547748.07")
+    assert "máximo" in banco.depositar(numero, "0.01")
+    assert "máximo" in banco.aplicar_lote([("Deposito", numero, "0.01")])[0]
+    assert int(banco.saldo(numero)) == CENTAVOS_MAXIMO
+
+
+def test_codigos_das_falhas_de_faixa(sistema):
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+    numero = banco.criar_conta(CPF)
+
+    resultados = banco.aplicar_lote([("Deposito", numero, "1e30"), ("Deposito", numero, "92233720368547758.07")])
+    assert [banco.codigo_resultado(resultado) for resultado in resultados] == ["valor_invalido", "ok"]
+    assert banco.codigo_resultado(banco.depositar(numero, "0.01")) == "valor_invalido"
@@ -0,0 +1,56 @@
+# Importação de Módulos Necessários
+import csv
+import multiprocessing
+
+import pytest
+
+from cpf import completar_cpf
+
+CPF = completar_cpf("529982247")
+
+
+def _banco_com_transacoes(sistema):
+    sistema.politica_limites.definir_regras([])
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+    numeros = [banco.criar_conta(CPF) for _ in range(4)]
+    for posicao, numero in enumerate(numeros[:3]):
+        for valor in range(1, 4 + posicao):
+            banco.depositar(numero, f"{valor}.{posicao}5")
+        banco.sacar(numero, "1")
+    esperado = [
+        (conta.numero, tipo, valor, instante)
+        for conta in sorted(banco.contas, key=lambda conta: conta.numero)
+        for instante, tipo, valor in conta.historico.transacoes_periodo()
+    ]
+    return banco, esperado
+
+
+def test_exportacao_csv_em_blocos(sistema, tmp_path):
+    banco, esperado = _banco_com_transacoes(sistema)
+
+    partes = sistema.exportar_historicos(banco, tmp_path, "csv", tamanho_bloco=2)
+    assert [(caminho.name, linhas) for caminho, linhas in partes] == [("parte-00000.csv", len(esperado))]
+    with open(partes[0][0], newline="", encoding="utf-8") as arquivo:
+        linhas = list(csv.reader(arquivo))
+    assert linhas[0] == ["numero", "tipo", "valor", "instante_ns"]
+    assert linhas[1:] == [
+        [str(numero), sistema.TIPOS_TRANSACAO[tipo], str(valor), str(instante)] for numero, tipo, valor, instante in esperado
+    ]
+
+
+def test_exportacao_em_colunas_e_em_paralelo(sistema, tmp_path):
+    np = pytest.importorskip("numpy")
+    banco, esperado = _banco_com_transacoes(sistema)
+    processos = 2 if "fork" in multiprocessing.get_all_start_methods() else 1
+
+    partes = sistema.exportar_historicos(banco, tmp_path, "colunas", processos=processos, tamanho_bloco=2)
+    assert len(partes) == processos and sum(linhas for _, linhas in partes) == len(esperado)
+
+    exportado = []
+    for diretorio, linhas in partes:
+        colunas = [np.load(diretorio / f"{nome}.npy", mmap_mode="r") for nome in ("numero", "tipo", "valor", "instante")]
+        assert [coluna.dtype.str[1:] for coluna in colunas] == ["i8", "i1", "i8", "i8"]
+        assert all(len(coluna) == linhas for coluna in colunas)
+        exportado += [tuple(int(valor) for valor in linha) for linha in zip(*colunas)]
+    assert exportado == esperado
@@ -0,0 +1,132 @@
+# Importação de Módulos Necessários
+import os
+import time
+from datetime import date
+
+import pytest
+
+from cpf import completar_cpf
+from relogio import NS_POR_SEGUNDO, RelogioManual
+
+CPF = completar_cpf("529982247")
+
+
+@pytest.fixture
+def fuso_sao_paulo():
+    if not os.path.exists("/usr/share/zoneinfo/America/Sao_Paulo") or not hasattr(time, "tzset"):
+        pytest.skip("fuso America/Sao_Paulo indisponível")
+    anterior = os.environ.get("TZ")
+    os.environ["TZ"] = "America/Sao_Paulo"
+    time.tzset()
+    yield
+    if anterior is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = anterior
+    time.tzset()
+
+
+def _conta(sistema):
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+    return banco, banco.conta(banco.criar_conta(CPF))
+
+
+def test_agregacoes_nao_prendem_o_buffer_das_colunas(sistema):
+    banco, conta = _conta(sistema)
+    banco.depositar(conta.numero, "10")
+    assert int(conta.historico.soma_valores("Deposito")) == 1000
+
+    # Com uma visão do buffer viva, a próxima transação falharia ao crescer o array
+    colunas = conta.historico.colunas_numpy()
+    banco.depositar(conta.numero, "5")
+    assert len(colunas["valor"]) == 1
+    assert int(conta.historico.soma_valores()) == 1500
+
+
+def test_contagem_por_dia_usa_o_fuso_de_cada_instante(sistema, fuso_sao_paulo):
+    # Em 2018 o horário de verão de São Paulo começou em 04/11 (UTC-3 -> UTC-2); hoje não
+    # há horário de verão, e 00:30 de 10/11/2018 cairia em 09/11 com o deslocamento atual
+    antes = int(time.mktime((2018, 11, 3, 23, 30, 0, 0, 0, -1))) * NS_POR_SEGUNDO
+    depois = int(time.mktime((2018, 11, 10, 0, 30, 0, 0, 0, -1))) * NS_POR_SEGUNDO
+    relogio = sistema.definir_relogio(RelogioManual(antes))
+    banco, conta = _conta(sistema)
+    banco.depositar(conta.numero, "1")
+    relogio.definir(depois)
+    banco.depositar(conta.numero, "1")
+    banco.sacar(conta.numero, "1")
+
+    esperado = {date(2018, 11, 3): 1, date(2018, 11, 10): 2}
+    assert conta.historico.contagem_por_dia() == esperado
+    assert conta.historico.contagem_por_dia("Saque") == {date(2018, 11, 10): 1}
+
+    sistema.np = None
+    assert conta.historico.contagem_por_dia() == esperado
+
+
+def test_extrato_pedido_a_cada_transacao_mantem_poucas_partes_no_cache(sistema):
+    banco, conta = _conta(sistema)
+    sistema.politica_limites.definir_regras([])
+    sistema.LINHAS_POR_PARTE = 64
+    historico = conta.historico
+
+    for valor in range(1, 301):
+        banco.depositar(conta.numero, str(valor))
+        assert historico.gerar_relatorio() == sistema.CABECALHO_RELATORIO + "".join(historico.linhas_relatorio())
+
+    quantidade, partes, linhas, _ = sistema.cache_extratos.obter(historico)
+    assert quantidade == sum(linhas) == 300
+    # Sem a fusão em níveis seriam 300 partes de uma linha
+    assert len(partes) <= 300 // 64 * 2 + 7
+    assert all(linhas_parte <= 64 for linhas_parte in linhas)
+
+
+def test_contadores_diarios_sem_percorrer_o_historico_e_virada_do_dia(sistema, monkeypatch):
+    meia_noite = int(time.mktime((2024, 3, 10, 0, 0, 0, 0, 0, -1))) * NS_POR_SEGUNDO
+    relogio = sistema.definir_relogio(RelogioManual(meia_noite - 60 * NS_POR_SEGUNDO))
+    banco, conta = _conta(sistema)
+    banco.depositar(conta.numero, "100")
+    for _ in range(3):
+        banco.sacar(conta.numero, "1")
+    assert banco.sacar(conta.numero, "1") == sistema.MENSAGENS_LIMITE[("Saque", sistema.EXCEDEU_QUANTIDADE)]
+
+    # As verificações de limite não podem formatar nem percorrer as transações já registradas
+    monkeypatch.setattr(sistema.Historico, "_transacao", None)
+    historico = conta.historico
+    assert (historico.numero_saques_do_dia(), historico.numero_depositos_do_dia()) == (3, 1)
+
+    relogio.definir(meia_noite)
+    assert (historico.numero_saques_do_dia(), historico.numero_depositos_do_dia()) == (0, 0)
+    assert banco.sacar(conta.numero, "1") == "\n=== Operação realizada com sucesso! ==="
+    assert historico.numero_saques_do_dia() == 1 and len(historico) == 5
+
+
+def test_extrato_paginado_por_cursor_e_periodo(sistema):
+    inicio = int(time.mktime((2024, 3, 10, 8, 0, 0, 0, 0, -1))) * NS_POR_SEGUNDO
+    relogio = sistema.definir_relogio(RelogioManual(inicio))
+    sistema.politica_limites.definir_regras([])
+    banco, conta = _conta(sistema)
+    for valor in range(1, 11):
+        banco.depositar(conta.numero, str(valor))
+        relogio.avancar(3600)
+    historico = conta.historico
+    todas = list(historico.linhas_relatorio())
+    assert len(todas) == 10 and todas[0].endswith("Deposito de R$ 1.00\n")
+
+    # As linhas são geradas sob demanda
+    linhas = historico.linhas_relatorio()
+    assert next(linhas) == todas[0]
+
+    paginas, cursor = [], 0
+    while cursor is not None:
+        pagina, cursor = historico.pagina_relatorio(cursor, tamanho_pagina=4)
+        paginas.append(pagina)
+    assert [len(pagina) for pagina in paginas] == [4, 4, 2] and sum(paginas, []) == todas
+
+    # Período [10h, 15h): da terceira à sétima transação
+    de, ate = inicio + 2 * 3600 * NS_POR_SEGUNDO, inicio + 7 * 3600 * NS_POR_SEGUNDO
+    assert list(historico.linhas_relatorio(de, ate)) == todas[2:7]
+    assert historico.pagina_relatorio(3, 2, de, ate) == (todas[3:5], 5)
+    assert banco.pagina_extrato(conta.numero, 0, 3, de, ate) == (todas[2:5], 3)
+    assert banco.pagina_extrato(conta.numero, 3, 3, de, ate) == (todas[5:7], None)
+    assert banco.pagina_extrato(999, 0) is None
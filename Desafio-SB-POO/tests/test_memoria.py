@@ -0,0 +1,35 @@
+# Importação de Módulos Necessários
+from array import array
+
+from cpf import completar_cpf
+
+CPF = completar_cpf("529982247")
+
+
+def test_objetos_do_dominio_sem_dict_por_instancia(sistema):
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+    conta = banco.conta(banco.criar_conta(CPF))
+    banco.depositar(conta.numero, "10")
+
+    objetos = [conta.cliente, conta, conta.historico, sistema.Saque("1"), sistema.Deposito("1")]
+    assert [type(objeto).__name__ for objeto in objetos] == ["PessoaFisica", "ContaCorrente", "Historico", "Saque", "Deposito"]
+    for objeto in objetos:
+        assert not hasattr(objeto, "__dict__"), type(objeto).__name__
+
+
+def test_colunas_criadas_na_primeira_transacao_e_agencias_compartilhadas(sistema):
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+    vazia, com_deposito = (banco.conta(banco.criar_conta(CPF)) for _ in range(2))
+    banco.depositar(com_deposito.numero, "10")
+
+    # Contas sem movimento compartilham a mesma tupla vazia no lugar das três colunas
+    assert vazia.historico._valores is sistema.Historico(1)._valores == ()
+    assert isinstance(com_deposito.historico._valores, array) and com_deposito.historico._uso_limites is not None
+    assert vazia.historico._uso_limites is None
+
+    # A agência lida de um registro restaurado é a mesma string em todas as contas
+    restauradas = [sistema._restaurar_conta(banco, numero, "".join(["00", "01"]), CPF, None) for numero in (100, 101)]
+    assert restauradas[0].agencia is restauradas[1].agencia
+    assert banco.contas.buscar("0001", 101) is restauradas[1]
@@ -0,0 +1,58 @@
+# Importação de Módulos Necessários
+import pytest
+
+from cpf import completar_cpf
+
+CPF_ANA = completar_cpf("529982247")
+CPF_BIA = completar_cpf("111444777")
+CPF_CAIO = completar_cpf("123456789")
+
+
+# Bytes que não são UTF-8 e um campo maior que csv.field_size_limit()
+@pytest.mark.parametrize("conteudo", [b"nome,data_nascimento,cpf,endereco\n\xff\xfe,1,2,3\n", b"nome\n" + b"a" * (1 << 20)])
+def test_importacao_com_arquivo_ilegivel_volta_ao_menu(sistema, tmp_path, monkeypatch, capsys, conteudo):
+    caminho = tmp_path / "clientes.csv"
+    caminho.write_bytes(conteudo)
+    entradas = iter(["7", str(caminho), "7", str(tmp_path / "inexistente.csv"), "q"])
+    monkeypatch.setattr("builtins.input", lambda *_: next(entradas))
+
+    sistema.main(sistema.Banco())
+    assert capsys.readouterr().out.count("Não foi possível ler o arquivo") == 2
+
+
+def test_importacao_de_clientes_em_blocos(sistema, tmp_path, monkeypatch, capsys):
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF_ANA, "Rua A")
+    caminho = tmp_path / "clientes.csv"
+    caminho.write_text(
+        "nome,data_nascimento,cpf,endereco\n"
+        f"Bia,02/02/1990,{CPF_BIA[:3]}.{CPF_BIA[3:6]}.{CPF_BIA[6:9]}-{CPF_BIA[9:]},Rua B\n"
+        f"Ana de novo,01/01/2000,{CPF_ANA},Rua A\n"
+        "Inválido,01/01/2000,12345678900,Rua X\n"
+        f" Caio ,03/03/1980,{CPF_CAIO},\"Rua C, 10\"\n"
+        f"Bia de novo,02/02/1990,{CPF_BIA},Rua B\n"
+        "Incompleto,01/01/2000\n",
+        encoding="utf-8",
+    )
+    lotes = []
+    monkeypatch.setattr(sistema.escritor_log, "escrever_lote", lotes.append)
+
+    resultado = sistema.importar_clientes_csv(banco, caminho, tamanho_bloco=2)
+    assert resultado == {
+        "importados": 2,
+        "invalidos": 2,
+        "duplicados": 2,
+        "rejeitados": [(3, "duplicado"), (4, "invalido"), (6, "duplicado"), (7, "invalido")],
+    }
+    caio = banco.clientes.buscar(CPF_CAIO)
+    assert (caio.nome, caio.cpf, caio._endereco) == ("Caio", CPF_CAIO, "Rua C, 10")
+    assert banco.clientes.buscar(CPF_BIA).cpf == CPF_BIA and banco.clientes.buscar(CPF_ANA).nome == "Ana"
+    # Um lote de log por bloco de linhas, com uma linha por cliente importado
+    assert [len(lote) for lote in lotes] == [1, 1, 0]
+
+    # Pelo menu, o mesmo arquivo não importa mais ninguém
+    entradas = iter(["7", str(caminho), "q"])
+    monkeypatch.setattr("builtins.input", lambda *_: next(entradas))
+    sistema.main(banco)
+    saida = capsys.readouterr().out
+    assert "=== 0 cliente(s) importado(s)! ===" in saida and "CPF inválido: 2\tDuplicados: 4" in saida
@@ -0,0 +1,117 @@
+# Importação de Módulos Necessários
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from cpf import completar_cpf
+from metricas import Histograma, RegistroLatencias, ServidorMetricas, gravar_metricas
+
+CPF = completar_cpf("529982247")
+
+
+def test_histograma_com_erro_relativo_pequeno():
+    histograma = Histograma()
+    for valor in range(1, 100_001):
+        histograma.registrar(valor * 1000)
+
+    resumo = histograma.resumo()
+    assert resumo["contagem"] == 100_000 and resumo["max"] == 100_000_000
+    assert resumo["media"] == 50_000_500
+    for chave, esperado in (("p50", 50_000_000), ("p90", 90_000_000), ("p99", 99_000_000)):
+        assert esperado <= resumo[chave] <= esperado * 1.016
+
+    assert Histograma().resumo() == {"contagem": 0, "media": 0, "p50": 0, "p90": 0, "p99": 0, "max": 0}
+    pequenos = Histograma()
+    for valor in (0, 5, 127):
+        pequenos.registrar(valor)
+    assert (pequenos.percentil(0.5), pequenos.percentil(1)) == (5, 127)
+
+
+def test_latencias_de_varias_threads_combinadas_no_resumo():
+    latencias = RegistroLatencias()
+
+    def medir(duracao):
+        for _ in range(100):
+            latencias.registrar("sacar", duracao)
+        latencias.registrar("depositar", duracao)
+
+    threads = [threading.Thread(target=medir, args=(duracao,)) for duracao in (1_000, 2_000, 3_000, 4_000)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    resumo = latencias.resumo()
+    assert list(resumo) == ["depositar", "sacar"]
+    assert resumo["sacar"]["contagem"] == 400 and resumo["sacar"]["max"] == 4_000
+    assert resumo["depositar"]["contagem"] == 4
+    assert "sacar" in latencias.formatar()
+
+    latencias.limpar()
+    assert latencias.resumo() == {}
+
+
+def test_decorador_de_log_mede_as_operacoes(sistema):
+    sistema.latencias.limpar()
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+    numero = banco.criar_conta(CPF)
+    banco.depositar(numero, "10")
+    banco.sacar(numero, "1")
+    banco.sacar(numero, "1")
+
+    resumo = sistema.latencias.resumo()
+    assert resumo["realizar_transacao"]["contagem"] == 3
+    assert resumo["adicionar_conta"]["contagem"] == 1
+    assert all(resumo[nome]["max"] > 0 for nome in ("realizar_transacao", "adicionar_conta"))
+
+
+def test_metricas_de_negocio_no_formato_do_prometheus(sistema, tmp_path):
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+    numero = banco.criar_conta(CPF)
+    banco.depositar(numero, "10")
+    banco.sacar(numero, "20")
+    for _ in range(4):
+        banco.sacar(numero, "1")
+
+    texto = sistema.texto_metricas(banco)
+    for linha in (
+        'banco_transacoes_total{tipo="Deposito",resultado="ok"} 1',
+        'banco_transacoes_total{tipo="Saque",resultado="ok"} 3',
+        'banco_rejeicoes_total{motivo="saldo_insuficiente"} 1',
+        'banco_rejeicoes_total{motivo="limite_diario"} 1',
+        "banco_clientes 1",
+        "banco_contas 1",
+        'banco_historico_transacoes{agregado="soma"} 4',
+        "# TYPE banco_latencia_segundos summary",
+    ):
+        assert linha + "\n" in texto
+
+    caminho = tmp_path / "banco.prom"
+    gravar_metricas(caminho, texto)
+    assert caminho.read_text(encoding="utf-8") == texto and not list(tmp_path.glob("*.tmp"))
+
+
+def test_servidor_de_metricas_responde_em_metrics():
+    chamadas = []
+
+    # O texto é gerado de novo a cada requisição
+    def gerar():
+        chamadas.append(None)
+        return f"banco_contas {len(chamadas)}\n"
+
+    servidor = ServidorMetricas(gerar, porta=0)
+    host, porta = servidor.endereco
+    try:
+        for esperado in (1, 2):
+            with urllib.request.urlopen(f"http://{host}:{porta}/metrics", timeout=10) as resposta:
+                assert resposta.read().decode() == f"banco_contas {esperado}\n"
+                assert resposta.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        with pytest.raises(urllib.error.HTTPError) as erro:
+            urllib.request.urlopen(f"http://{host}:{porta}/outro", timeout=10)
+        assert erro.value.code == 404
+    finally:
+        servidor.parar()
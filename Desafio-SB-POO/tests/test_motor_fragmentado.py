@@ -0,0 +1,83 @@
+# Importação de Módulos Necessários
+import threading
+
+import pytest
+
+from cpf import completar_cpf
+from motor_fragmentado import MotorFragmentado
+from wal import ler_registros
+
+CPF = completar_cpf("529982247")
+CPF_FORMATADO = f"{CPF[:3]}.{CPF[3:6]}.{CPF[6:9]}-{CPF[9:]}"
+
+
+def test_cpf_validado_e_normalizado_no_coordenador(sistema):
+    with MotorFragmentado(sistema.Banco, 2) as motor:
+        assert "inválido" in motor.criar_cliente("Ana", "01/01/2000", "123.456.789-00", "Rua A")
+        assert "sucesso" in motor.criar_cliente("Ana", "01/01/2000", CPF_FORMATADO, "Rua A")
+        assert "Já existe" in motor.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+
+
+def test_criar_conta_pelo_cpf_formatado(sistema):
+    with MotorFragmentado(sistema.Banco, 2) as motor:
+        motor.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+        numeros = [motor.criar_conta(CPF_FORMATADO), motor.criar_conta(CPF), motor.criar_conta(CPF)]
+        assert numeros == [1, 2, 3]
+        assert motor.contas_do_cliente(CPF_FORMATADO) == numeros
+        assert motor.criar_conta(completar_cpf("111444777")) is None
+
+        assert "sucesso" in motor.depositar(3, "10")
+        assert int(motor.saldo(3)) == 1000
+
+
+def test_criar_conta_falha_se_o_fragmento_recusa(sistema):
+    class BancoSemContas(sistema.Banco):
+        def criar_conta(self, cpf, numero=None):
+            return None
+
+    with MotorFragmentado(BancoSemContas, 2) as motor:
+        motor.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+        with pytest.raises(RuntimeError):
+            motor.criar_conta(CPF)
+        assert motor.contas_do_cliente(CPF) == []
+
+
+def test_clientes_em_paralelo_no_coordenador(sistema):
+    with MotorFragmentado(sistema.Banco, 2) as motor:
+        barreira = threading.Barrier(8)
+        resultados = []
+
+        def criar():
+            barreira.wait()
+            resultados.append(motor.criar_cliente("Ana", "01/01/2000", CPF, "Rua A"))
+
+        threads = [threading.Thread(target=criar) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sum("sucesso" in resultado for resultado in resultados) == 1
+
+
+def test_fragmentos_nao_gravam_no_wal_do_coordenador(sistema, tmp_path):
+    sistema.ativar_wal(tmp_path / "coordenador.wal")
+
+    def inicializar(indice):
+        sistema.ativar_wal(tmp_path / f"fragmento-{indice}.wal")
+
+    with MotorFragmentado(sistema.Banco, 2, inicializar=inicializar) as motor:
+        motor.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+        numeros = [motor.criar_conta(CPF) for _ in range(4)]
+        for numero in numeros:
+            motor.depositar(numero, "10")
+    with MotorFragmentado(sistema.Banco, 1) as motor:
+        motor.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+        motor.depositar(motor.criar_conta(CPF), "10")
+
+    # Cada fragmento recupera as suas contas do próprio WAL; o do coordenador fica vazio
+    sistema.wal.fechar()
+    assert list(ler_registros(tmp_path / "coordenador.wal")) == []
+    for indice in range(2):
+        banco = sistema.recuperar_banco(tmp_path / f"fragmento-{indice}.wal")
+        assert sorted(banco.saldos()) == [numero for numero in numeros if numero % 2 == indice]
+        assert all(int(saldo) == 1000 for saldo in banco.saldos().values())
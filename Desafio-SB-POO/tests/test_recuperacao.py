@@ -0,0 +1,226 @@
+# Importação de Módulos Necessários
+import os
+import threading
+import time
+
+import pytest
+
+import wal as modulo_wal
+from cpf import completar_cpf
+from wal import DURABILIDADE_GRUPO, DURABILIDADE_POR_OPERACAO, RegistroWAL, ler_registros
+
+CPF = completar_cpf("529982247")
+
+
+def _banco_com_conta(sistema):
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+    return banco, banco.criar_conta(CPF)
+
+
+def test_cauda_rasgada_e_descartada(tmp_path):
+    caminho = tmp_path / "wal.bin"
+    wal = RegistroWAL(caminho, DURABILIDADE_POR_OPERACAO)
+    wal.registrar({"op": "a"})
+    wal.registrar({"op": "b"})
+    wal.fechar()
+
+    tamanho = os.path.getsize(caminho)
+    with open(caminho, "ab") as arquivo:
+        arquivo.write(b"\x10\x00\x00\x00\x00")  # cabeçalho incompleto de um terceiro quadro
+    assert [registro["op"] for _, registro in ler_registros(caminho)] == ["a", "b"]
+
+    # Ao reabrir, a cauda é removida e a numeração continua do último registro válido
+    wal = RegistroWAL(caminho, DURABILIDADE_POR_OPERACAO)
+    assert os.path.getsize(caminho) == tamanho
+    assert wal.registrar({"op": "c"}) == 3
+    wal.fechar()
+    assert [lsn for lsn, _ in ler_registros(caminho)] == [1, 2, 3]
+
+
+def test_saldo_e_historico_sao_gravados_juntos(sistema, tmp_path):
+    caminho = tmp_path / "wal.bin"
+    sistema.ativar_wal(caminho, DURABILIDADE_POR_OPERACAO)
+    banco, numero = _banco_com_conta(sistema)
+    tamanho_antes = os.path.getsize(caminho)
+    banco.depositar(numero, 100)
+    sistema.wal.fechar()
+    sistema.wal = None
+
+    # Um único quadro: cortado em qualquer ponto, nem o saldo nem o histórico são reaplicados
+    with open(caminho, "rb") as arquivo:
+        dados = arquivo.read()
+    for corte in (tamanho_antes + 1, len(dados) - 1):
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(dados[:corte])
+        recuperado = sistema.recuperar_banco(caminho)
+        conta = recuperado.conta(numero)
+        assert (int(conta.saldo), len(conta.historico)) == (0, 0)
+
+    with open(caminho, "wb") as arquivo:
+        arquivo.write(dados)
+    conta = sistema.recuperar_banco(caminho).conta(numero)
+    assert (int(conta.saldo), len(conta.historico), conta.historico.numero_depositos_do_dia()) == (10000, 1, 1)
+
+
+def test_falha_de_fsync_chega_a_todos_no_grupo(tmp_path, monkeypatch):
+    caminho = tmp_path / "wal.bin"
+    wal = RegistroWAL(caminho, DURABILIDADE_GRUPO)
+    wal.registrar({"op": "antes"})
+
+    fsync_original = os.fsync
+
+    # O fsync do líder espera os outros dois escritores entrarem na fila e então falha
+    def fsync_com_falha(descritor):
+        limite = time.monotonic() + 5
+        while len(wal._pendentes) < 3 and time.monotonic() < limite:
+            time.sleep(0.001)
+        raise OSError("falha simulada")
+
+    monkeypatch.setattr(modulo_wal.os, "fsync", fsync_com_falha)
+
+    erros = []
+
+    def escrever(indice):
+        try:
+            wal.registrar({"op": f"escritor-{indice}"})
+        except OSError as erro:
+            erros.append(erro)
+
+    threads = [threading.Thread(target=escrever, args=(indice,)) for indice in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert not any(thread.is_alive() for thread in threads)
+    assert len(erros) == 3
+    assert wal.falhou
+    with pytest.raises(OSError):
+        wal.registrar({"op": "depois"})
+
+    # Nada do que falhou ficou no arquivo para ser reaplicado na recuperação
+    monkeypatch.setattr(modulo_wal.os, "fsync", fsync_original)
+    wal.fechar()
+    assert [registro["op"] for _, registro in ler_registros(caminho)] == ["antes"]
+
+
+def test_reaplicacao_do_wal_apos_snapshot(sistema, tmp_path):
+    caminho_wal = tmp_path / "wal.bin"
+    diretorio = tmp_path / "snapshots"
+    sistema.ativar_wal(caminho_wal, DURABILIDADE_POR_OPERACAO)
+    banco, numero = _banco_com_conta(sistema)
+    banco.depositar(numero, 500)
+    banco.sacar(numero, 100)
+    sistema.gravar_snapshot_banco(banco, diretorio)
+    banco.depositar(numero, 50)
+    banco.aplicar_lote([("Saque", numero, 20), ("Deposito", numero, 70)])
+    sistema.wal.fechar()
+    sistema.wal = None
+
+    recuperado = sistema.iniciar_banco(caminho_wal, diretorio)
+    original, conta = banco.conta(numero), recuperado.conta(numero)
+    assert int(conta.saldo) == int(original.saldo) == 50000
+    assert list(conta.historico._valores) == list(original.historico._valores)
+    assert conta.historico.numero_depositos_do_dia() == original.historico.numero_depositos_do_dia() == 3
+    assert conta.historico.numero_saques_do_dia() == original.historico.numero_saques_do_dia() == 2
+
+
+def test_quadros_anteriores_ao_snapshot_sao_pulados_pelo_cabecalho(tmp_path, monkeypatch):
+    caminho = tmp_path / "wal.bin"
+    wal = RegistroWAL(caminho, DURABILIDADE_POR_OPERACAO)
+    for indice in range(5):
+        wal.registrar_varios([{"op": indice}, {"op": indice}])
+    wal.fechar()
+
+    decodificados = []
+    original = modulo_wal._registros_do_quadro
+    monkeypatch.setattr(
+        modulo_wal, "_registros_do_quadro", lambda lsn, conteudo: decodificados.append(lsn) or original(lsn, conteudo)
+    )
+    assert [lsn for lsn, _ in ler_registros(caminho, 7)] == [8, 9, 10]
+    assert decodificados == [8, 10]
+
+
+def test_rotacao_no_snapshot_e_varredura_unica(sistema, tmp_path, monkeypatch):
+    caminho_wal = tmp_path / "wal.bin"
+    diretorio = tmp_path / "snapshots"
+    sistema.ativar_wal(caminho_wal, DURABILIDADE_POR_OPERACAO)
+    banco, numero = _banco_com_conta(sistema)
+    banco.depositar(numero, 500)
+    sistema.gravar_snapshot_banco(banco, diretorio)
+    # O segmento separado na rotação já está coberto pelo snapshot recém-gravado
+    assert modulo_wal.listar_segmentos(caminho_wal) == []
+    assert os.path.getsize(caminho_wal) == 0
+
+    # Com dois snapshots mantidos, o segmento entre eles fica até o mais antigo sair
+    banco.sacar(numero, 100)
+    sistema.gravar_snapshot_banco(banco, diretorio)
+    lsn_segundo = sistema.wal.ultimo_lsn
+    banco.sacar(numero, 10)
+    sistema.gravar_snapshot_banco(banco, diretorio)
+    assert [lsn for lsn, _ in modulo_wal.listar_segmentos(caminho_wal)] == [sistema.wal.ultimo_lsn]
+    assert sistema.wal.ultimo_lsn > lsn_segundo
+    banco.depositar(numero, 50)
+    ultimo_lsn = sistema.wal.ultimo_lsn
+    sistema.wal.fechar()
+    sistema.wal = None
+
+    # O segmento coberto pelo snapshot não é lido, e o WAL reabre sem percorrer o arquivo de novo
+    monkeypatch.setattr(modulo_wal, "_registros_do_arquivo", lambda *argumentos: pytest.fail("segmento lido"))
+    varredura = modulo_wal.VarreduraWAL()
+    recuperado = sistema.iniciar_banco(caminho_wal, diretorio, varredura)
+    assert recuperado.conta(numero)._saldo == 44000
+    assert (varredura.concluida, varredura.ultimo_lsn) == (True, ultimo_lsn)
+
+    monkeypatch.setattr(modulo_wal, "_varrer", lambda *argumentos: pytest.fail("arquivo percorrido de novo"))
+    wal = sistema.ativar_wal(caminho_wal, DURABILIDADE_POR_OPERACAO, varredura)
+    assert wal.registrar({"op": "nada"}) == ultimo_lsn + 1
+
+
+def test_criacao_de_contas_e_depositos_intercalados(sistema, tmp_path, monkeypatch):
+    caminho = tmp_path / "wal.bin"
+    registrar_mudancas = sistema.registrar_mudancas
+
+    # Alarga a janela entre a criação da conta e o registro dela no WAL
+    def registrar_devagar(registros):
+        if registros[0]["op"] == "conta":
+            time.sleep(0.002)
+        return registrar_mudancas(registros)
+
+    monkeypatch.setattr(sistema, "registrar_mudancas", registrar_devagar)
+    sistema.ativar_wal(caminho, DURABILIDADE_GRUPO)
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+    parar = threading.Event()
+    erros = []
+
+    # Deposita em cada conta assim que ela aparece no índice, enquanto as próximas são criadas
+    def depositar():
+        numero = sistema.Conta._numeros.atual
+        try:
+            while not parar.is_set():
+                if banco.conta(numero) is not None:
+                    banco.depositar(numero, "1")
+                    numero += 1
+        except Exception as erro:
+            erros.append(erro)
+
+    thread = threading.Thread(target=depositar)
+    thread.start()
+    numeros = [banco.criar_conta(CPF) for _ in range(100)]
+    parar.set()
+    thread.join()
+    assert not erros
+    sistema.wal.fechar()
+    sistema.wal = None
+
+    recuperado = sistema.recuperar_banco(caminho)
+    assert {numero: recuperado.conta(numero)._saldo for numero in numeros} == {
+        numero: banco.conta(numero)._saldo for numero in numeros
+    }
+
+
+def test_registro_de_conta_inexistente_indica_wal_corrompido(sistema):
+    banco = sistema.Banco()
+    with pytest.raises(ValueError, match="WAL corrompido"):
+        sistema.aplicar_registro_wal(banco, 1, {"op": "saldo", "numero": 7, "delta": 100})
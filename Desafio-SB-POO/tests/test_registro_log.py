@@ -0,0 +1,108 @@
+# Importação de Módulos Necessários
+import json
+import threading
+import time
+
+import pytest
+
+import registro_log
+from cpf import completar_cpf
+from registro_log import EscritorLogEmLote
+from relogio import NS_POR_SEGUNDO, RelogioManual
+
+
+def test_erro_de_gravacao_nao_termina_a_thread(tmp_path):
+    escritor = EscritorLogEmLote(tmp_path, intervalo_flush=0.05)  # um diretório não pode ser aberto
+    escritor.escrever("a\n")
+    escritor.descarregar()
+    assert isinstance(escritor.erro, OSError)
+    assert escritor.linhas_descartadas == 1
+
+    escritor.escrever("b\n")
+    escritor.descarregar()
+    assert escritor.linhas_descartadas == 2
+    assert escritor.encerrar()
+
+
+def test_escrever_falha_se_a_thread_terminou(tmp_path, monkeypatch):
+    def falhar(*args, **kwargs):
+        raise MemoryError("sem memória")
+
+    escritor = EscritorLogEmLote(tmp_path / "log.txt", tamanho_fila=1, intervalo_flush=0.05)
+    monkeypatch.setattr(escritor, "_drenar_fila", falhar)
+    monkeypatch.setattr(threading, "excepthook", lambda argumentos: None)
+    escritor._iniciar()
+    escritor._thread.join()
+
+    inicio = time.monotonic()
+    with pytest.raises(RuntimeError, match="sem memória"):
+        escritor.escrever("a\n")
+    with pytest.raises(RuntimeError):
+        escritor.descarregar()
+    escritor.encerrar()
+    assert time.monotonic() - inicio < 1
+
+
+def test_encerrar_respeita_o_timeout_com_a_fila_cheia(tmp_path, monkeypatch):
+    liberar = threading.Event()
+    original = registro_log.EscritorLogEmLote._drenar_fila
+
+    def drenar_depois(self):
+        liberar.wait()
+        original(self)
+
+    monkeypatch.setattr(registro_log.EscritorLogEmLote, "_drenar_fila", drenar_depois)
+    escritor = EscritorLogEmLote(tmp_path / "log.txt", tamanho_fila=1, intervalo_flush=0.05)
+    escritor.escrever("a\n")
+
+    inicio = time.monotonic()
+    assert escritor.encerrar(timeout=0.2) is False
+    assert time.monotonic() - inicio < 1
+
+    liberar.set()
+    escritor._thread.join(1)
+    assert (tmp_path / "log.txt").read_text() == "a\n"
+
+
+def test_saldos_reconstruidos_incluem_os_lotes(sistema, tmp_path):
+    caminho = tmp_path / "log.jsonl"
+    sistema.FORMATO_LOG = "jsonl"
+    sistema.escritor_log.encerrar()
+    sistema.escritor_log = EscritorLogEmLote(caminho)
+
+    banco = sistema.Banco()
+    cpf = completar_cpf("529982247")
+    banco.criar_cliente("Ana", "01/01/2000", cpf, "Rua A")
+    numeros = [banco.criar_conta(cpf), banco.criar_conta(cpf)]
+    banco.depositar(numeros[0], "100")
+    banco.aplicar_lote(
+        [
+            ("Deposito", numeros[1], "30"),
+            ("Saque", numeros[0], "25.50"),
+            ("Saque", numeros[1], "1000"),  # acima do limite por saque
+            ("Saque", numeros[1], "400"),  # saldo insuficiente
+            ("Deposito", numeros[1], "-1"),  # valor inválido
+        ]
+    )
+    banco.sacar(numeros[1], "5")
+    sistema.escritor_log.descarregar()
+
+    saldos = registro_log.reconstruir_saldos(registro_log.ler_registros_jsonl(caminho))
+    assert saldos == {numero: int(banco.saldo(numero)) for numero in numeros} == {numeros[0]: 7450, numeros[1]: 2500}
+
+
+def test_linhas_invalidas_sao_ignoradas_sem_perder_o_bloco(tmp_path):
+    caminho = tmp_path / "log.jsonl"
+    caminho.write_bytes(b'{"op":"a"}\n{"op":"b"\n{"op":"c"},{"op":"d"}\n\xff\n{"op":"e"}\n{"op":')
+
+    invalidas = []
+    registros = list(registro_log.ler_registros_jsonl(caminho, tamanho_bloco=16, invalidas=invalidas))
+    assert [registro["op"] for registro in registros] == ["a", "e"]
+    assert invalidas == [b'{"op":"b"', b'{"op":"c"},{"op":"d"}', b"\xff", b'{"op":']
+
+
+def test_ts_do_log_estruturado_vem_do_relogio(sistema):
+    sistema.FORMATO_LOG = "jsonl"
+    sistema.definir_relogio(RelogioManual(1_700_000_000 * NS_POR_SEGUNDO))
+    linha = sistema.formatar_linha_log("depositar", (), {}, "\n=== Depósito realizado com sucesso! ===")
+    assert json.loads(linha)["ts"] == 1_700_000_000 * NS_POR_SEGUNDO
@@ -0,0 +1,49 @@
+# Importação de Módulos Necessários
+from cpf import completar_cpf
+
+CPF_ANA = completar_cpf("529982247")
+CPF_BIA = completar_cpf("111444777")
+
+
+def _formatado(cpf):
+    return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+
+
+def test_registro_de_clientes_indexado_pelo_cpf_normalizado(sistema, monkeypatch):
+    ana = sistema.PessoaFisica("Ana", "01/01/2000", CPF_ANA, "Rua A")
+    clientes = sistema.RegistroClientes([ana])
+
+    assert clientes.buscar(_formatado(CPF_ANA)) is ana and _formatado(CPF_ANA) in clientes
+    assert clientes.buscar(CPF_BIA) is None and CPF_BIA not in clientes
+    assert not clientes.adicionar(sistema.PessoaFisica("Outra Ana", "01/01/2000", _formatado(CPF_ANA), "Rua C"))
+
+    bia = sistema.PessoaFisica("Bia", "02/02/1990", CPF_BIA, "Rua B")
+    repetidos = [sistema.PessoaFisica("Ana", "01/01/2000", CPF_ANA, "Rua A"), bia, sistema.PessoaFisica("Bia", "", CPF_BIA, "")]
+    assert clientes.adicionar_em_lote(repetidos) == [bia]
+    assert len(clientes) == 2 and list(clientes) == [ana, bia]
+
+    # filtrar_cliente usa o índice em vez de percorrer os clientes
+    monkeypatch.setattr(sistema.RegistroClientes, "__iter__", None)
+    assert sistema.filtrar_cliente(_formatado(CPF_BIA), clientes) is bia
+    assert sistema.filtrar_cliente(completar_cpf("123456789"), clientes) is None
+
+
+def test_registro_de_contas_por_agencia_numero_e_por_cliente(sistema, monkeypatch):
+    banco = sistema.Banco()
+    for nome, cpf in (("Ana", CPF_ANA), ("Bia", CPF_BIA)):
+        banco.criar_cliente(nome, "01/01/2000", cpf, "Rua A")
+    primeira, segunda = banco.criar_conta(CPF_ANA), banco.criar_conta(CPF_ANA)
+    da_bia = banco.criar_conta(CPF_BIA)
+    ana = banco.clientes.buscar(CPF_ANA)
+
+    assert banco.contas.buscar("0001", str(segunda)).numero == segunda
+    assert banco.contas.buscar("0002", segunda) is None and banco.conta("abc") is None
+    assert [conta.numero for conta in banco.contas.contas_do_cliente(ana)] == [primeira, segunda]
+    assert banco.contas.buscar_do_cliente(ana, da_bia) is None
+
+    # Com mais de uma conta, a operação vai para a conta escolhida, não para a primeira
+    monkeypatch.setattr("builtins.input", lambda *_: str(segunda))
+    conta = sistema.recuperar_conta_cliente(ana, banco.contas)
+    assert conta is banco.conta(segunda)
+    monkeypatch.setattr("builtins.input", lambda *_: str(da_bia))
+    assert sistema.recuperar_conta_cliente(ana, banco.contas) is None
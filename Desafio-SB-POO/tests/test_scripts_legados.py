@@ -0,0 +1,49 @@
+# Importação de Módulos Necessários
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ_REPOSITORIO = Path(__file__).resolve().parent.parent.parent
+DIRETORIO_LEGADO = RAIZ_REPOSITORIO / "Desafio-Sistema-Bancario"
+
+
+# Executa um dos scripts de Desafio-Sistema-Bancario com as entradas do menu, fora da pasta dele
+def _executar(script, *entradas):
+    processo = subprocess.run(
+        [sys.executable, str(DIRETORIO_LEGADO / script)],
+        input="\n".join(entradas) + "\n",
+        capture_output=True,
+        text=True,
+        cwd=RAIZ_REPOSITORIO,
+        timeout=60,
+    )
+    assert processo.returncode == 0, processo.stderr
+    return processo.stdout
+
+
+def test_sistema_bancario_recusa_valores_nao_finitos_e_limita_saques():
+    saida = _executar(
+        "SistemaBancario.py",
+        *("d", "inf", "d", "1e307", "d", "10", "s", "nan"),
+        *("s", "1") * 3,
+        *("s", "c", "q"),
+    )
+
+    assert saida.count("Entrada inválida") == 3
+    assert saida.count("Saque de R$1.00 realizado") == 3
+    assert "limite diário de 3 saques" in saida
+    assert "Saldo atual: R$7.00" in saida
+
+
+def test_sistema_bancario2_recusa_valores_nao_finitos_e_limita_saques():
+    saida = _executar(
+        "Sistema_Bancario2.py",
+        *("d", "inf", "d", "10", "s", "inf", "s", "1e308"),
+        *("s", "1") * 4,
+        *("e", "q"),
+    )
+
+    assert saida.count("O valor informado é inválido") == 3
+    assert saida.count("Saque realizado com sucesso") == 3
+    assert "número de saques excede o limite" in saida
+    assert "Saldo atual: R$ 7.00" in saida
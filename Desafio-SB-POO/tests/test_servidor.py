@@ -0,0 +1,98 @@
+# Importação de Módulos Necessários
+import asyncio
+import json
+import threading
+
+from cpf import completar_cpf
+from servidor import TAMANHO_MAXIMO_LINHA, ServidorBancario, gerar_carga
+
+CPF = completar_cpf("529982247")
+
+
+def _servidor_com_conta(sistema):
+    banco = sistema.Banco()
+    banco.criar_cliente("Ana", "01/01/2000", CPF, "Rua A")
+    return ServidorBancario(banco), banco.criar_conta(CPF)
+
+
+def test_requisicoes_invalidas(sistema):
+    servidor, numero = _servidor_com_conta(sistema)
+    try:
+        for linha in (b"SALDO\t\xff\n", b"SALDO\tabc\n"):
+            assert json.loads(servidor.processar(linha))["codigo"] == "requisicao_invalida"
+        # Valor monetário inválido tem o mesmo código da operação avulsa e do lote no Banco
+        assert json.loads(servidor.processar(f"DEPOSITO\t{numero}\t1e999999\n".encode()))["codigo"] == "valor_invalido"
+        assert json.loads(servidor.processar(f"SALDO\t{numero}\n".encode()))["dados"] == "0.00"
+    finally:
+        servidor.fechar()
+
+
+def test_linha_longa_e_descartada_ate_o_fim(sistema):
+    servidor, numero = _servidor_com_conta(sistema)
+
+    async def conversar():
+        async with await asyncio.start_server(servidor.atender, "127.0.0.1", 0, limit=TAMANHO_MAXIMO_LINHA) as tcp:
+            porta = tcp.sockets[0].getsockname()[1]
+            leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+            escritor.write(b"X" * (3 * TAMANHO_MAXIMO_LINHA) + b"\n")
+            escritor.write(f"DEPOSITO\t{numero}\t10\n".encode())
+            escritor.write(f"SALDO\t{numero}\n".encode())
+            respostas = [json.loads(await leitor.readline()) for _ in range(3)]
+            escritor.close()
+            await escritor.wait_closed()
+            return respostas
+
+    try:
+        respostas = asyncio.run(conversar())
+    finally:
+        servidor.fechar()
+    assert [resposta["codigo"] for resposta in respostas] == ["requisicao_invalida", "ok", "ok"]
+    assert respostas[2]["dados"] == "10.00"
+
+
+def test_extrato_completo_enviado_em_partes(sistema):
+    servidor, numero = _servidor_com_conta(sistema)
+    banco = servidor._banco
+    sistema.politica_limites.definir_regras([])
+    sistema.LINHAS_POR_PARTE = 2
+    banco.aplicar_lote([("Deposito", numero, f"{valor}.50") for valor in range(1, 8)])
+
+    resposta = servidor.processar(f"EXTRATO\t{numero}\n".encode())
+    pedacos = list(resposta)
+    servidor.fechar()
+    assert len(pedacos) > 3
+    assert json.loads(b"".join(pedacos)) == {"ok": True, "codigo": "ok", "mensagem": "", "dados": banco.extrato(numero)}
+
+
+def test_clientes_com_o_mesmo_cpf_em_paralelo(sistema):
+    servidor, _ = _servidor_com_conta(sistema)
+    outro = completar_cpf("111444777")
+    barreira = threading.Barrier(8)
+    codigos = []
+
+    def criar():
+        barreira.wait()
+        codigos.append(json.loads(servidor.processar(f"CLIENTE\tBia\t01/01/2000\t{outro}\tRua B\n".encode()))["codigo"])
+
+    threads = [threading.Thread(target=criar) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    servidor.fechar()
+    assert sorted(codigos) == ["cliente_duplicado"] * 7 + ["ok"]
+
+
+def test_gerador_de_carga_nao_esbarra_no_limite_diario(sistema):
+    servidor = ServidorBancario(sistema.Banco())
+
+    async def medir():
+        async with await asyncio.start_server(servidor.atender, "127.0.0.1", 0, limit=TAMANHO_MAXIMO_LINHA) as tcp:
+            return await gerar_carga("127.0.0.1", tcp.sockets[0].getsockname()[1], clientes=4, requisicoes=100)
+
+    try:
+        resultado = asyncio.run(medir())
+    finally:
+        servidor.fechar()
+    assert resultado["requisicoes"] > 400
+    assert set(resultado["codigos"]) == {"ok"}
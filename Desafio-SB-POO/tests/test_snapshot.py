@@ -0,0 +1,77 @@
+# Importação de Módulos Necessários
+import threading
+from array import array
+
+import pytest
+
+import snapshot
+from snapshot import SnapshotsPeriodicos, carregar_snapshot_mais_recente, gravar_snapshot, ler_snapshot
+
+CLIENTES = [("Ana", "01/01/2000", "52998224725", "Rua A"), ("Bia", "02/02/1990", "11144477735", "Rua B")]
+
+
+def _contas():
+    return [
+        (1, "0001", "52998224725", 50000, 1500, 3, 4, array("q", [10, 20]), array("q", [1000, 500]), array("b", [1, 0])),
+        (2, "0001", "11144477735", None, 0, 0, 0, array("q"), array("q"), array("b")),
+    ]
+
+
+def test_snapshot_gravado_e_lido_pelo_mmap(tmp_path, monkeypatch):
+    diretorios = []
+    monkeypatch.setattr(snapshot, "sincronizar_diretorio", diretorios.append)
+
+    caminho = gravar_snapshot(tmp_path, 7, 3, CLIENTES, iter(_contas()))
+    # O diretório é sincronizado depois da renomeação do arquivo temporário
+    assert diretorios == [caminho] and not list(tmp_path.glob("*.tmp"))
+
+    lido = ler_snapshot(caminho)
+    assert (lido.lsn_inicial, lido.proximo_numero, lido.clientes) == (7, 3, CLIENTES)
+    assert lido.contas == _contas()
+
+
+def test_snapshot_corrompido_e_ignorado(tmp_path):
+    antigo = gravar_snapshot(tmp_path, 1, 2, CLIENTES, _contas())
+    recente = gravar_snapshot(tmp_path, 9, 3, CLIENTES, _contas())
+
+    dados = bytearray(recente.read_bytes())
+    dados[-10] ^= 0xFF
+    recente.write_bytes(bytes(dados))
+    with pytest.raises(ValueError, match="CRC"):
+        ler_snapshot(recente)
+
+    recente.write_bytes(bytes(dados[:20]))
+    with pytest.raises(ValueError, match="incompleto"):
+        ler_snapshot(recente)
+    assert carregar_snapshot_mais_recente(tmp_path).caminho == antigo
+
+
+def test_snapshot_da_versao_1_converte_instantes(tmp_path):
+    caminho = gravar_snapshot(tmp_path, 1, 2, CLIENTES, _contas())
+
+    # A versão fica no cabeçalho, fora do CRC
+    dados = bytearray(caminho.read_bytes())
+    dados[8:12] = (1).to_bytes(4, "little")
+    caminho.write_bytes(bytes(dados))
+    assert list(ler_snapshot(caminho).contas[0][7]) == [10 * 1_000_000_000, 20 * 1_000_000_000]
+
+
+def test_thread_periodica_continua_depois_de_uma_falha(capsys):
+    chamadas = []
+    terceira = threading.Event()
+
+    def gravar():
+        chamadas.append(None)
+        if len(chamadas) >= 3:
+            terceira.set()
+        if len(chamadas) <= 2:
+            raise OSError("disco cheio")
+
+    periodicos = SnapshotsPeriodicos(gravar, intervalo=0.01)
+    try:
+        assert terceira.wait(10)
+    finally:
+        periodicos.parar()
+
+    assert periodicos.falhas == 2 and isinstance(periodicos.erro, OSError)
+    assert "disco cheio" in capsys.readouterr().err
@@ -0,0 +1,370 @@
+# Importação de Módulos Necessários
+import atexit
+import json
+import os
+import struct
+import threading
+import zlib
+
+# Níveis de durabilidade do log de escrita antecipada (WAL)
+DURABILIDADE_POR_OPERACAO = "operacao"  # Cada chamada grava e executa seu próprio fsync
+DURABILIDADE_GRUPO = "grupo"  # Chamadas concorrentes compartilham um único fsync (group commit)
+DURABILIDADE_ASSINCRONA = "assincrona"  # Retorna sem esperar; uma thread grava periodicamente
+DURABILIDADES = (DURABILIDADE_POR_OPERACAO, DURABILIDADE_GRUPO, DURABILIDADE_ASSINCRONA)
+
+# Cabeçalho de cada quadro: tamanho do conteúdo, CRC32 do conteúdo e número de sequência
+# (LSN) do último registro do quadro
+_CABECALHO = struct.Struct("<IIQ")
+
+
+# Os registros de uma mesma chamada formam um único quadro, com um único CRC: na
+# recuperação ou todos são lidos, ou nenhum (um quadro com um registro guarda o objeto,
+# com vários, a lista; os registros do quadro têm LSNs consecutivos terminando em `lsn`)
+def _quadro(lsn, registros):
+    conteudo = json.dumps(registros[0] if len(registros) == 1 else registros, separators=(",", ":"))
+    conteudo = conteudo.encode("utf-8")
+    return _CABECALHO.pack(len(conteudo), zlib.crc32(conteudo), lsn) + conteudo
+
+
+def _registros_do_quadro(lsn, conteudo):
+    registros = json.loads(conteudo)
+    if isinstance(registros, dict):
+        return [(lsn, registros)]
+    primeiro = lsn - len(registros) + 1
+    return [(primeiro + indice, registro) for indice, registro in enumerate(registros)]
+
+
+# Definição da classe VarreduraWAL
+# Resultado da leitura do arquivo ativo do WAL feita na recuperação (último LSN e tamanho
+# válido), reaproveitado ao reabri-lo para gravação em vez de percorrê-lo de novo
+class VarreduraWAL:
+    __slots__ = ("ultimo_lsn", "tamanho_valido", "concluida")
+
+    def __init__(self):
+        self.ultimo_lsn = 0
+        self.tamanho_valido = 0
+        self.concluida = False
+
+
+# Segmentos antigos do WAL, separados do arquivo ativo em rotacionar(): "<caminho>.<último LSN>",
+# em ordem de LSN, como (último LSN, caminho)
+def listar_segmentos(caminho):
+    diretorio, nome = os.path.split(os.fspath(caminho))
+    prefixo = nome + "."
+    segmentos = []
+    for entrada in os.listdir(diretorio or "."):
+        sufixo = entrada[len(prefixo) :]
+        if entrada.startswith(prefixo) and len(sufixo) == 20 and sufixo.isdigit():
+            segmentos.append((int(sufixo), os.path.join(diretorio, entrada)))
+    return sorted(segmentos)
+
+
+# Remove os segmentos cujos registros (todos com LSN <= ate_lsn) já estão em um snapshot
+def remover_segmentos(caminho, ate_lsn):
+    for ultimo_lsn, segmento in listar_segmentos(caminho):
+        if ultimo_lsn <= ate_lsn:
+            os.remove(segmento)
+
+
+# Lê os registros válidos do WAL (segmentos e arquivo ativo), devolvendo (lsn, registro) com
+# lsn > a_partir_de_lsn. Segmentos inteiros e quadros anteriores a `a_partir_de_lsn` são
+# pulados só pelo nome ou pelo cabeçalho, sem ler nem decodificar o conteúdo.
+# A leitura de cada arquivo para no primeiro quadro incompleto ou corrompido (gravação
+# interrompida por queda). Com `varredura`, guarda nela o resultado da leitura do arquivo ativo.
+def ler_registros(caminho, a_partir_de_lsn=0, varredura=None):
+    ultimo_lsn = 0
+    for ultimo_lsn, segmento in listar_segmentos(caminho):
+        if ultimo_lsn > a_partir_de_lsn:
+            yield from _registros_do_arquivo(segmento, a_partir_de_lsn)
+
+    tamanho_valido = 0
+    for lsn, conteudo, tamanho_valido in _varrer(caminho, a_partir_de_lsn):
+        ultimo_lsn = lsn
+        if conteudo is not None:
+            for lsn_registro, registro in _registros_do_quadro(lsn, conteudo):
+                if lsn_registro > a_partir_de_lsn:
+                    yield lsn_registro, registro
+
+    if varredura is not None:
+        varredura.ultimo_lsn = ultimo_lsn
+        varredura.tamanho_valido = tamanho_valido
+        varredura.concluida = True
+
+
+def _registros_do_arquivo(caminho, a_partir_de_lsn):
+    for lsn, conteudo, _ in _varrer(caminho, a_partir_de_lsn):
+        if conteudo is not None:
+            for lsn_registro, registro in _registros_do_quadro(lsn, conteudo):
+                if lsn_registro > a_partir_de_lsn:
+                    yield lsn_registro, registro
+
+
+# Percorre os quadros de um arquivo, devolvendo (lsn, conteúdo, posição após o quadro).
+# Quadros com lsn <= pular_ate_lsn são pulados pelo cabeçalho (conteúdo None), desde que o
+# LSN cresça e o quadro caiba no arquivo; o último quadro do arquivo sempre tem o CRC
+# conferido, pois é onde uma gravação interrompida deixa uma cauda rasgada.
+def _varrer(caminho, pular_ate_lsn=-1):
+    if not os.path.exists(caminho):
+        return
+
+    with open(caminho, "rb") as arquivo:
+        tamanho_arquivo = os.fstat(arquivo.fileno()).st_size
+        posicao = 0
+        lsn_anterior = -1
+        while True:
+            cabecalho = arquivo.read(_CABECALHO.size)
+            if len(cabecalho) < _CABECALHO.size:
+                return
+            tamanho, crc, lsn = _CABECALHO.unpack(cabecalho)
+            fim = posicao + _CABECALHO.size + tamanho
+            if lsn <= lsn_anterior or fim > tamanho_arquivo:
+                return
+
+            if lsn <= pular_ate_lsn and fim < tamanho_arquivo:
+                arquivo.seek(fim)
+                conteudo = None
+            else:
+                conteudo = arquivo.read(tamanho)
+                if len(conteudo) < tamanho or zlib.crc32(conteudo) != crc:
+                    return
+                if lsn <= pular_ate_lsn:
+                    conteudo = None
+            posicao = fim
+            lsn_anterior = lsn
+            yield lsn, conteudo, posicao
+
+
+# Definição da classe RegistroWAL
+# Log de escrita antecipada em arquivo binário. Cada mudança de estado é gravada antes de ser
+# aplicada; no modo "grupo", quem chega enquanto um fsync está em andamento aguarda e tem
+# seus registros gravados pelo próximo líder em uma única escrita e um único fsync.
+# Se uma gravação falha, o arquivo volta ao último tamanho durável e o WAL passa ao estado
+# de falha: a exceção chega a todos os que aguardavam e as chamadas seguintes também falham.
+class RegistroWAL:
+    def __init__(self, caminho, durabilidade=DURABILIDADE_GRUPO, intervalo_assincrono=0.05, varredura=None):
+        if durabilidade not in DURABILIDADES:
+            raise ValueError(f"Durabilidade inválida: {durabilidade!r}")
+
+        self._caminho = caminho
+        self._durabilidade = durabilidade
+        self._intervalo_assincrono = intervalo_assincrono
+
+        # Descarta uma eventual cauda corrompida antes de voltar a gravar no arquivo. Se a
+        # recuperação acabou de ler o arquivo (ler_registros com `varredura`), usa o resultado.
+        if varredura is not None and varredura.concluida:
+            ultimo_lsn, tamanho_valido = varredura.ultimo_lsn, varredura.tamanho_valido
+        else:
+            segmentos = listar_segmentos(caminho)
+            ultimo_lsn, tamanho_valido = (segmentos[-1][0] if segmentos else 0), 0
+            for lsn, _, posicao in _varrer(caminho):
+                ultimo_lsn, tamanho_valido = lsn, posicao
+        # Sem buffer: uma gravação que falhou não fica em memória para ser gravada depois
+        self._arquivo = open(caminho, "ab", buffering=0)
+        self._arquivo.truncate(tamanho_valido)
+
+        self._condicao = threading.Condition()
+        self._pendentes = []
+        self._lsn_pendente = ultimo_lsn
+        self._lsn_duravel = ultimo_lsn
+        self._tamanho_duravel = tamanho_valido
+        self._gravando = False
+        self._fechado = False
+        self._erro = None
+
+        self._thread = None
+        if durabilidade == DURABILIDADE_ASSINCRONA:
+            self._thread = threading.Thread(target=self._gravar_periodicamente, name="wal", daemon=True)
+            self._thread.start()
+        atexit.register(self.fechar)
+
+        # Um processo filho (fork) herda o arquivo, mas os quadros pendentes e os LSNs são do
+        # pai: a cópia do filho fica fechada, e gravar nela levanta RuntimeError
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._fechar_no_filho)
+
+    def _fechar_no_filho(self):
+        self._condicao = threading.Condition()
+        self._pendentes = []
+        self._gravando = False
+        self._fechado = True
+        self._thread = None
+
+    @property
+    def caminho(self):
+        return self._caminho
+
+    @property
+    def durabilidade(self):
+        return self._durabilidade
+
+    @property
+    def ultimo_lsn(self):
+        return self._lsn_pendente
+
+    @property
+    def falhou(self):
+        return self._erro is not None
+
+    def _verificar_falha(self):
+        if self._erro is not None:
+            raise OSError(f"O WAL está em estado de falha: {self._erro}") from self._erro
+
+    def registrar(self, registro):
+        return self.registrar_varios([registro])
+
+    # Grava os registros e devolve o LSN do último; nos modos síncronos só retorna após o fsync
+    def registrar_varios(self, registros):
+        registros = list(registros)
+        lsn = self.enfileirar(registros)
+        return self.aguardar(lsn) if registros else lsn
+
+    # Coloca os registros na fila de gravação, em um único quadro, e devolve o LSN do último,
+    # sem esperar o disco. A ordem dos LSNs é a ordem das chamadas.
+    def enfileirar(self, registros):
+        with self._condicao:
+            if self._fechado:
+                raise RuntimeError("O WAL já foi fechado.")
+            self._verificar_falha()
+
+            registros = list(registros)
+            if not registros:
+                return self._lsn_pendente
+            self._lsn_pendente += len(registros)
+            self._pendentes.append(_quadro(self._lsn_pendente, registros))
+            return self._lsn_pendente
+
+    # Espera o registro `lsn` ficar durável, conforme a durabilidade, e devolve o próprio LSN
+    def aguardar(self, lsn):
+        if self._durabilidade == DURABILIDADE_ASSINCRONA:
+            return lsn
+
+        with self._condicao:
+            if self._durabilidade == DURABILIDADE_POR_OPERACAO:
+                if self._lsn_duravel < lsn:
+                    self._verificar_falha()
+                    self._descarregar(liberar_trava=False)
+                return lsn
+
+            while self._lsn_duravel < lsn:
+                self._verificar_falha()
+                if self._gravando:
+                    self._condicao.wait()
+                else:
+                    self._descarregar(liberar_trava=True)
+            return lsn
+
+    # Grava e sincroniza tudo o que estiver pendente; chamado com a trava adquirida. Os
+    # quadros só saem da fila depois do fsync: quem chega durante a gravação entra no fim dela.
+    def _descarregar(self, liberar_trava):
+        if not self._pendentes:
+            return
+
+        quantidade = len(self._pendentes)
+        dados = b"".join(self._pendentes)
+        lsn = self._lsn_pendente
+        self._gravando = True
+
+        if liberar_trava:
+            self._condicao.release()
+        try:
+            self._gravar(dados)
+            os.fsync(self._arquivo.fileno())
+        except BaseException as erro:
+            if liberar_trava:
+                self._condicao.acquire()
+            self._gravando = False
+            self._falhar(erro)
+            raise
+        if liberar_trava:
+            self._condicao.acquire()
+        self._gravando = False
+
+        del self._pendentes[:quantidade]
+        self._tamanho_duravel += len(dados)
+        self._lsn_duravel = lsn
+        self._condicao.notify_all()
+
+    def _gravar(self, dados):
+        dados = memoryview(dados)
+        while dados:
+            dados = dados[self._arquivo.write(dados) :]
+
+    # Estado de falha: descarta o que não chegou ao disco, remove uma eventual gravação
+    # parcial (para que a recuperação não reaplique uma mudança que não foi feita) e acorda
+    # quem aguardava, que recebe a exceção
+    def _falhar(self, erro):
+        self._erro = erro
+        self._pendentes = []
+        try:
+            self._arquivo.truncate(self._tamanho_duravel)
+            os.fsync(self._arquivo.fileno())
+        except OSError:
+            pass
+        self._condicao.notify_all()
+
+    def _gravar_periodicamente(self):
+        with self._condicao:
+            while not self._fechado and self._erro is None:
+                self._condicao.wait(self._intervalo_assincrono)
+                if not self._gravando:
+                    try:
+                        self._descarregar(liberar_trava=True)
+                    except Exception:
+                        return
+
+    # Sincroniza o arquivo ativo e o renomeia para um segmento ("<caminho>.<último LSN>"),
+    # recomeçando em um arquivo vazio; chamado antes de um snapshot, para que os segmentos
+    # cobertos por ele possam ser removidos depois (remover_segmentos). Devolve o último LSN.
+    def rotacionar(self):
+        with self._condicao:
+            if self._fechado:
+                raise RuntimeError("O WAL já foi fechado.")
+            while self._gravando:
+                self._condicao.wait()
+            self._verificar_falha()
+            self._descarregar(liberar_trava=False)
+            if self._tamanho_duravel == 0:
+                return self._lsn_duravel
+
+            self._arquivo.close()
+            os.replace(self._caminho, f"{os.fspath(self._caminho)}.{self._lsn_duravel:020d}")
+            self._arquivo = open(self._caminho, "ab", buffering=0)
+            self._tamanho_duravel = 0
+            sincronizar_diretorio(self._caminho)
+            return self._lsn_duravel
+
+    # Aguarda até que tudo o que já foi registrado esteja em disco
+    def sincronizar(self):
+        with self._condicao:
+            while self._gravando:
+                self._condicao.wait()
+            self._verificar_falha()
+            self._descarregar(liberar_trava=False)
+
+    def fechar(self):
+        with self._condicao:
+            if self._fechado:
+                return
+            self._fechado = True
+            self._condicao.notify_all()
+        if self._thread:
+            self._thread.join()
+        try:
+            if self._erro is None:
+                self.sincronizar()
+        finally:
+            self._arquivo.close()
+
+
+# Torna duráveis a renomeação e a criação de arquivos no diretório (onde o sistema permite)
+def sincronizar_diretorio(caminho):
+    try:
+        descritor = os.open(os.path.dirname(os.fspath(caminho)) or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descritor)
+    except OSError:
+        pass
+    finally:
+        os.close(descritor)
@@ -1,3 +1,8 @@
+import math  # Usado para recusar valores infinitos ou indefinidos
+
+# Os limites diários são os mesmos do sistema orientado a objetos (Desafio-SB-POO/limites.py)
+from compartilhado import limites
+
 # Define o menu do sistema bancário
 menu = '''
 ♦️ Sistema Bancário ♦️
@@ -17,9 +22,19 @@ menu = '''
 saldo = 0.0  # Saldo inicial é 0.0
 limite = 1000.0  # Limite para saque por transação
 extrato = []  # Lista para armazenar as transações
-numero_saques = 0  # Contador de saques realizados
-numero_deposito = 0  # Contador de depósitos realizados
-LIMITE_SAQUE = 3  # Limite de saques diários
+LIMITE_SAQUE = limites.LIMITE_TRANSACOES_DIARIAS  # Limite de saques diários
+# Política de limites: o uso recomeça à meia-noite, mesmo com o programa aberto
+politica = limites.PoliticaLimites(("Saque", "Deposito"), limites.regras_diarias(("Saque",)))
+uso = limites.UsoLimites()  # Saques e depósitos do dia
+
+
+# Lê um valor em reais; "inf", "nan" e valores grandes demais para contar em centavos são recusados
+def ler_valor(mensagem):
+    valor = float(input(mensagem))
+    if not math.isfinite(valor * 100):
+        raise ValueError(f"Valor não finito: {valor}")
+    return valor
+
 
 # Inicia o loop do sistema bancário
 while True:
@@ -30,11 +45,11 @@ while True:
         # Depositar
         try:
             # Solicita o valor do depósito e converte para float
-            deposito = float(input("Digite o valor do depósito: "))
+            deposito = ler_valor("Digite o valor do depósito: ")
             if deposito > 0:
+                politica.registrar(uso, "Deposito", round(deposito * 100))  # Conta o depósito do dia
                 saldo += deposito  # Adiciona o valor ao saldo
                 extrato.append(f"Depósito: +R${deposito:.2f}")  # Adiciona a transação ao extrato
-                numero_deposito += 1  # Incrementa o contador de depósitos
                 print(f"Depósito de R${deposito:.2f} realizado com sucesso.")
             else:
                 print("O valor do depósito deve ser positivo.")
@@ -43,15 +58,15 @@ while True:
 
     elif opcao == "s":
         # Sacar
-        if numero_saques < LIMITE_SAQUE:
+        if politica.verificar(uso, "Saque", 0) is None:
             try:
                 # Solicita o valor do saque e converte para float
-                saque = float(input("Digite o valor do saque: "))
+                saque = ler_valor("Digite o valor do saque: ")
                 if saque > 0:
                     if saque <= saldo and saque <= limite:
+                        politica.registrar(uso, "Saque", round(saque * 100))  # Conta o saque do dia
                         saldo -= saque  # Subtrai o valor do saldo
                         extrato.append(f"Saque: -R${saque:.2f}")  # Adiciona a transação ao extrato
-                        numero_saques += 1  # Incrementa o contador de saques
                         print(f"Saque de R${saque:.2f} realizado com sucesso.")
                     elif saque > limite:
                         print(f"\nO saque excede o limite de R${limite:.2f} por saque.\n")
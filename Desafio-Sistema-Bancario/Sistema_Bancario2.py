@@ -1,5 +1,13 @@
+import math  # Importa o módulo math, usado para recusar valores infinitos ou indefinidos.
 import textwrap  # Importa o módulo textwrap, que será usado para remover a indentação do texto.
 
+# O validador de CPF e os limites diários são compartilhados com o sistema orientado a
+# objetos (Desafio-SB-POO/cpf.py e Desafio-SB-POO/limites.py)
+from compartilhado import cpf, limites as modulo_limites
+
+normalizar_cpf = cpf.normalizar_cpf
+validar_cpf = cpf.validar_cpf
+
 # Função para exibir o menu
 def menu():
     menu_texto = '''\n
@@ -21,10 +29,14 @@ def menu():
     # Exibe o menu com as opções e retorna a entrada do usuário
     return input(textwrap.dedent(menu_texto))
 
+# Verifica se o valor é finito também em centavos ("inf", "nan" e valores grandes demais não são)
+def valor_finito(valor):
+    return math.isfinite(valor * 100)
+
 # Função para depositar dinheiro
 def depositar(saldo, valor, extrato, /):
-    # Verifica se o valor a ser depositado é maior que zero
-    if valor > 0:
+    # Verifica se o valor a ser depositado é finito e maior que zero
+    if valor_finito(valor) and valor > 0:
         # Adiciona o valor ao saldo
         saldo += valor
         # Adiciona a transação ao extrato
@@ -38,13 +50,18 @@ def depositar(saldo, valor, extrato, /):
     return saldo, extrato
 
 # Função para sacar dinheiro
-def sacar(*, saldo, valor, extrato, limite, numero_saques, limite_saques):
+def sacar(*, saldo, valor, extrato, limite, limites, uso):
+    # Recusa valores não finitos antes de consultar a política de limites
+    if not valor_finito(valor):
+        print("\n@@@ Operação falhou! O valor informado é inválido. @@@")
+        return saldo, extrato
+
     # Verifica se o valor do saque excede o saldo
     excedeu_saldo = valor > saldo
     # Verifica se o valor do saque excede o limite
     excedeu_limite = valor > limite
-    # Verifica se o número de saques excede o limite diário
-    excedeu_saques = numero_saques >= limite_saques
+    # Verifica se o número de saques do dia excede o limite (o uso recomeça à meia-noite)
+    excedeu_saques = limites.verificar(uso, "Saque", round(valor * 100)) is not None
 
     if excedeu_saldo:
         print("\n@@@ Operação falhou! Saldo insuficiente. @@@")
@@ -57,14 +74,14 @@ def sacar(*, saldo, valor, extrato, limite, numero_saques, limite_saques):
         saldo -= valor
         # Adiciona a transação ao extrato
         extrato += f"Saque: -R${valor:.2f}\n"
-        # Incrementa o número de saques realizados
-        numero_saques += 1
+        # Conta o saque no uso do dia
+        limites.registrar(uso, "Saque", round(valor * 100))
         print("\n=== Saque realizado com sucesso! ===")
     else:
         print("\n@@@ Operação falhou! O valor informado é inválido. @@@")
 
-    # Retorna o saldo atualizado, o extrato e o número de saques
-    return saldo, extrato, numero_saques
+    # Retorna o saldo atualizado e o extrato
+    return saldo, extrato
 
 # Função para exibir o extrato
 def exibir_extrato(saldo, /, *, extrato):
@@ -77,7 +94,12 @@ def exibir_extrato(saldo, /, *, extrato):
 
 # Função para criar um novo usuário
 def criar_usuario(usuarios):
-    cpf = input('Informe o CPF (somente número): ')
+    cpf = normalizar_cpf(input('Informe o CPF (somente número): '))
+    # Verifica os dígitos verificadores do CPF
+    if not validar_cpf(cpf):
+        print("\n@@@ Operação falhou! CPF inválido. @@@")
+        return
+
     # Verifica se o usuário já existe na lista de usuários
     usuario = filtrar_usuario(cpf, usuarios)
 
@@ -108,7 +130,7 @@ def filtrar_usuario(cpf, usuarios):
 
 # Função para criar uma nova conta
 def criar_conta(agencia, numero_conta, usuarios):
-    cpf = input('Informe o CPF do usuário: ')
+    cpf = normalizar_cpf(input('Informe o CPF do usuário: '))
     # Verifica se o usuário com o CPF fornecido existe na lista de usuários
     usuario = filtrar_usuario(cpf, usuarios)
 
@@ -137,13 +159,14 @@ def listar_contas(contas):
 
 # Função principal para controlar o fluxo do sistema
 def main():
-    LIMITE_SAQUE = 3  # Limite diário de saques
     AGENCIA = '0001'  # Número da agência bancária
 
     saldo = 0  # Saldo inicial
     limite = 500  # Limite de saque
     extrato = ""  # Extrato inicial
-    numero_saques = 0  # Contador de saques
+    # Limite diário de saques compartilhado com o sistema orientado a objetos
+    limites = modulo_limites.PoliticaLimites(("Saque", "Deposito"), modulo_limites.regras_diarias(("Saque",)))
+    uso_limites = modulo_limites.UsoLimites()  # Saques do dia
     usuarios = []  # Lista de usuários
     contas = []  # Lista de contas
     numero_conta = 1  # Contador para número de contas
@@ -168,13 +191,13 @@ def main():
                 # Coleta o valor a ser sacado
                 valor = float(input('\nInforme o valor do saque:💸 '))
                 # Chama a função de saque
-                saldo, extrato, numero_saques = sacar(
+                saldo, extrato = sacar(
                     saldo=saldo,
                     valor=valor,
                     extrato=extrato,
                     limite=limite,
-                    numero_saques=numero_saques,
-                    limite_saques=LIMITE_SAQUE
+                    limites=limites,
+                    uso=uso_limites
                 )
             except ValueError:
                 print("\n@@@ Entrada inválida! Por favor, insira um valor numérico. @@@")
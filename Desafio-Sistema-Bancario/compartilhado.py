@@ -0,0 +1,30 @@
+# Importação de Módulos Necessários
+import importlib.util
+import sys
+from pathlib import Path
+
+# Módulos do sistema orientado a objetos usados também pelos scripts desta pasta
+DIRETORIO_COMPARTILHADO = Path(__file__).resolve().parent.parent / "Desafio-SB-POO"
+
+
+# Carrega um módulo de DIRETORIO_COMPARTILHADO pelo caminho do arquivo, sem alterar o
+# sys.path (que poderia fazer outro módulo com o mesmo nome ser importado no lugar).
+# O módulo fica registrado em sys.modules para que as importações entre eles funcionem.
+def carregar_modulo(nome):
+    if nome in sys.modules:
+        return sys.modules[nome]
+    spec = importlib.util.spec_from_file_location(nome, DIRETORIO_COMPARTILHADO / f"{nome}.py")
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nome] = modulo
+    try:
+        spec.loader.exec_module(modulo)
+    except BaseException:
+        del sys.modules[nome]
+        raise
+    return modulo
+
+
+# limites depende de relogio, que precisa ser carregado antes
+carregar_modulo("relogio")
+cpf = carregar_modulo("cpf")
+limites = carregar_modulo("limites")